@@ -0,0 +1,212 @@
+"""Benchmark every processor and the DataProcessingManager entry points.
+
+Usage:
+    python benchmarks/bench_approaches.py                         # default sizes 1KB-10MB
+    python benchmarks/bench_approaches.py --sizes 1KB,1MB,1GB --shapes text
+    python benchmarks/bench_approaches.py --save-baseline         # store results as the baseline
+    python benchmarks/bench_approaches.py --baseline benchmarks/baseline.json --threshold 0.2
+
+Results (time, throughput and peak memory per case) are written as JSON. When a
+baseline exists, cases slower than baseline * (1 + threshold), or whose peak
+memory grew past baseline * (1 + threshold), are reported as regressions and
+the script exits with status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the src directory to the Python path, like the tests do
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(current_dir, '..', 'src')
+sys.path.insert(0, src_dir)
+
+from main import DataProcessingManager
+from approaches import (
+    ChunkingProcessor,
+    SummarizationProcessor,
+    ReferenceBasedProcessor,
+    HierarchicalProcessor,
+    TokenAwareTruncationProcessor,
+    StreamingProcessor
+)
+from utils import generate_data
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+DEFAULT_SHAPES = "text,numeric,records,nested"
+DEFAULT_OUTPUT = os.path.join(current_dir, "results.json")
+DEFAULT_BASELINE = os.path.join(current_dir, "baseline.json")
+UNITS = {"KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3}
+
+
+def parse_size(text):
+    """Parse sizes like '10KB', '1MB' or '2000' into a character count"""
+    text = text.strip().upper()
+    for unit, factor in UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def build_cases(storage_dir):
+    """Name -> callable(data) for every processor and manager entry point"""
+    manager = DataProcessingManager()
+    manager.processors['reference'] = ReferenceBasedProcessor(storage_dir=storage_dir)
+    truncation = TokenAwareTruncationProcessor()
+
+    return {
+        "chunking": ChunkingProcessor().process_large_data_in_chunks,
+        "summarization": SummarizationProcessor().process_with_summarization,
+        "reference": ReferenceBasedProcessor(storage_dir=storage_dir).process_with_reference,
+        "hierarchical": HierarchicalProcessor().process_hierarchically,
+        "truncation": truncation.process_with_truncation,
+        "streaming": StreamingProcessor().iterative_processing,
+        "manager.process_with_approach": lambda data: manager.process_with_approach(data, "chunking"),
+        "manager.process_with_all_approaches": lambda data: manager.process_with_all_approaches(data, workers=1),
+        "manager.recommend_approach": manager.recommend_approach,
+        # Batch truncation against the per-document loop, over 1000-character documents
+        "truncation.per_document_loop": lambda data: [
+            truncation.process_with_truncation(doc) for doc in ChunkingProcessor().iter_chunks(data, 1000)
+        ],
+        "truncation.process_many_with_truncation": lambda data: truncation.process_many_with_truncation(
+            ChunkingProcessor().iter_chunks(data, 1000)
+        ),
+        # Bulk ingestion across a process pool (peak memory covers this process only, not the workers)
+        "manager.process_many": lambda data: manager.process_many(
+            ChunkingProcessor().iter_chunks(data, 1000), "truncation"
+        ),
+    }
+
+
+def measure(func, data, repeats, track_memory):
+    """Best wall time over `repeats` runs, plus peak traced memory from one extra run"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func(data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(sizes, shapes, cases=None, repeats=3, track_memory=True, verbose=True):
+    """Run every case over every shape and size, returning a list of result records"""
+    storage_dir = tempfile.mkdtemp()
+    try:
+        all_cases = build_cases(storage_dir)
+        selected = {name: func for name, func in all_cases.items() if cases is None or name in cases}
+        results = []
+        for shape in shapes:
+            for size in sizes:
+                data = generate_data(shape, size)
+                actual_size = len(str(data))
+                for name, func in selected.items():
+                    seconds, peak = measure(func, data, repeats, track_memory)
+                    record = {
+                        "case": name,
+                        "shape": shape,
+                        "size": size,
+                        "actual_size": actual_size,
+                        "seconds": seconds,
+                        "throughput_mb_s": actual_size / seconds / 1e6 if seconds > 0 else None,
+                        "peak_bytes": peak
+                    }
+                    results.append(record)
+                    if verbose:
+                        memory = f"{peak / 1e6:9.2f} MB" if peak is not None else "        -"
+                        print(f"{shape:8} {size:>12,} {name:42} {seconds * 1000:10.3f} ms {memory}")
+        return results
+    finally:
+        shutil.rmtree(storage_dir, ignore_errors=True)
+
+
+def find_regressions(results, baseline, threshold):
+    """Cases whose time or peak memory grew by more than `threshold` (a fraction) over the baseline"""
+    previous = {(r["case"], r["shape"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for record in results:
+        old = previous.get((record["case"], record["shape"], record["size"]))
+        if not old:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            # peak_bytes is None when either run skipped memory tracking
+            if old.get(metric) and record.get(metric) is not None and \
+                    record[metric] > old[metric] * (1 + threshold):
+                regressions.append({
+                    "case": record["case"],
+                    "shape": record["shape"],
+                    "size": record["size"],
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "value": record[metric],
+                    "ratio": record[metric] / old[metric]
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the data processing approaches")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated sizes, e.g. 1KB,1MB,1GB")
+    parser.add_argument("--shapes", default=DEFAULT_SHAPES, help="comma-separated data shapes")
+    parser.add_argument("--cases", default=None, help="comma-separated case names (default: all)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory run")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="also write results to the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown or peak memory growth fraction before flagging")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    shapes = [shape.strip() for shape in args.shapes.split(",")]
+    cases = [case.strip() for case in args.cases.split(",")] if args.cases else None
+
+    results = run_benchmarks(sizes, shapes, cases, args.repeats, not args.no_memory)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+        "regressions": regressions
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    for regression in regressions:
+        change = "slower" if regression["metric"] == "seconds" else "more peak memory"
+        print(f"REGRESSION: {regression['case']} ({regression['shape']}, {regression['size']:,}) "
+              f"{regression['ratio']:.2f}x {change} than baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,30 @@
 # File: /python-approaches-project/python-approaches-project/src/approaches/__init__.py
 
+import importlib
 
-from .approach1 import ChunkingProcessor
-from .approach2 import SummarizationProcessor
-from .approach3 import ReferenceBasedProcessor
-from .approach4 import HierarchicalProcessor
-from .approach5 import TokenAwareTruncationProcessor
-from .approach6 import StreamingProcessor
+# Processors are imported on first access (PEP 562) so that using one approach
+# does not pay for the imports of all the others (e.g. asyncio for streaming).
+_EXPORTS = {
+    'ChunkingProcessor': '.approach1',
+    'SummarizationProcessor': '.approach2',
+    'ReferenceBasedProcessor': '.approach3',
+    'HierarchicalProcessor': '.approach4',
+    'TokenAwareTruncationProcessor': '.approach5',
+    'StreamingProcessor': '.approach6',
+    'RollingContext': '.approach6',
+    'AsyncStreamingProcessor': '.approach6'
+}
 
-__all__ = [
-    'ChunkingProcessor',
-    'SummarizationProcessor', 
-    'ReferenceBasedProcessor',
-    'HierarchicalProcessor',
-    'TokenAwareTruncationProcessor',
-    'StreamingProcessor'
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
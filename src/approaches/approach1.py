@@ -1,3 +1,17 @@
+# Relative when imported as src.approaches, top-level when src/ is on sys.path
+try:
+    from ..utils.instrumentation import span
+    from ..utils.json_stream import iter_leaves, iter_json_leaves, chunk_leaves
+    from ..utils.dedup import MinHashDeduplicator
+    from ..utils.spill import spillable_list
+    from ..utils.helpers import rendered_length
+except ImportError:
+    from utils.instrumentation import span
+    from utils.json_stream import iter_leaves, iter_json_leaves, chunk_leaves
+    from utils.dedup import MinHashDeduplicator
+    from utils.spill import spillable_list
+    from utils.helpers import rendered_length
+
 class ChunkingProcessor:
     def __init__(self, chunk_size=1000):
         self.chunk_size = chunk_size
@@ -12,8 +26,32 @@ class ChunkingProcessor:
         size = chunk_size or self.chunk_size
         return [data_list[i:i + size] for i in range(0, len(data_list), size)]
     
+    def iter_chunks(self, data, chunk_size=None):
+        """Lazily yield chunks of data without building the chunk list"""
+        size = chunk_size or self.chunk_size
+        if not isinstance(data, (str, list)):
+            data = str(data)
+        for i in range(0, len(data), size):
+            yield data[i:i + size]
+    
+    def iter_structure_chunks(self, data, chunk_size=None, max_tokens=None):
+        """Lazily yield chunks of nested dicts/lists, split between values and tagged with their JSON path"""
+        return chunk_leaves(iter_leaves(data), chunk_size or self.chunk_size, max_tokens)
+    
+    def iter_json_file_chunks(self, source, chunk_size=None, max_tokens=None, buffer_size=65536):
+        """Like iter_structure_chunks, but parses a JSON file (path or file object) as a stream"""
+        return chunk_leaves(iter_json_leaves(source, buffer_size), chunk_size or self.chunk_size, max_tokens)
+    
     def process_chunk(self, chunk):
         """Process a single chunk of data"""
+        if isinstance(chunk, dict) and "entries" in chunk:
+            return {
+                "chunk_size": chunk["size"],
+                "chunk_type": "structure",
+                "path": chunk["path"],
+                "processed": True,
+                "summary": f"Processed {len(chunk['entries'])} entries under {chunk['path']}"
+            }
         return {
             "chunk_size": len(chunk),
             "chunk_type": type(chunk).__name__,
@@ -21,24 +59,68 @@ class ChunkingProcessor:
             "summary": f"Processed {len(chunk)} items"
         }
     
-    def process_large_data_in_chunks(self, data):
-        """Process large data by breaking it into chunks"""
-        if isinstance(data, str):
-            chunks = self.chunk_text(data)
-        elif isinstance(data, list):
-            chunks = self.chunk_list(data)
-        else:
-            chunks = self.chunk_text(str(data))
+    def process_large_data_in_chunks(self, data, profile=None, dedup=False, dedup_threshold=0.9):
+        """Process large data by breaking it into chunks.
+        
+        With `dedup=True`, chunks that are near-duplicates (MinHash similarity
+        >= `dedup_threshold`) of an earlier chunk are not processed; their
+        result only records "duplicate_of" and "similarity".
+        """
+        if not isinstance(data, (str, list, dict)):
+            # Rendered in its own span so chunking.split times only the split
+            with span("chunking.render"):
+                data = profile.text if profile is not None else str(data)
+        
+        with span("chunking.split"):
+            if isinstance(data, (str, list)):
+                # Chunks are sliced as they are processed rather than all held at once
+                chunks = self.iter_chunks(data)
+            else:
+                # Chunked between keys/values instead of slicing the str() rendering
+                chunks = self.iter_structure_chunks(data)
+        
+        deduplicator = MinHashDeduplicator(dedup_threshold) if dedup else None
+        with span("chunking.process_chunks"):
+            results = self.process_chunks(chunks, deduplicator)
+        
+        with span("chunking.render"):
+            # Measured value by value so a large dict or list is never rendered whole
+            original_size = profile.size if profile is not None else rendered_length(data)
         
-        results = []
+        result = {
+            "method": "chunking",
+            "total_chunks": len(results),
+            "chunk_results": results,
+            "original_size": original_size
+        }
+        if deduplicator is not None:
+            result["dedup"] = deduplicator.report()
+        return result
+    
+    def process_chunks(self, chunks, deduplicator=None):
+        """Process an iterable of chunks, tagging each result with its index"""
+        results = spillable_list()
         for i, chunk in enumerate(chunks):
+            if deduplicator is not None:
+                with span("chunking.dedup"):
+                    duplicate = deduplicator.check(i, chunk)
+                if duplicate is not None:
+                    results.append({"chunk_index": i, **duplicate})
+                    continue
             result = self.process_chunk(chunk)
             result["chunk_index"] = i
             results.append(result)
+        return results
+    
+    def process_json_file(self, source, max_tokens=None, buffer_size=65536):
+        """Process a JSON file in structure-aware chunks without loading the document"""
+        with span("chunking.process_chunks"):
+            results = self.process_chunks(self.iter_json_file_chunks(source, max_tokens=max_tokens,
+                                                                     buffer_size=buffer_size))
         
         return {
-            "method": "chunking",
-            "total_chunks": len(chunks),
+            "method": "structured_chunking",
+            "total_chunks": len(results),
             "chunk_results": results,
-            "original_size": len(str(data))
-        }
\ No newline at end of file
+            "total_size": sum(result["chunk_size"] for result in results)
+        }
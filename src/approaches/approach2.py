@@ -1,5 +1,10 @@
 import statistics
 
+try:
+    from ..utils.instrumentation import span
+except ImportError:
+    from utils.instrumentation import span
+
 class SummarizationProcessor:
     def __init__(self, max_sample_size=5):
         self.max_sample_size = max_sample_size
@@ -44,28 +49,34 @@ class SummarizationProcessor:
     
     def summarize_data(self, large_dataset):
         """Summarize large dataset into key information"""
+        with span("summarization.metrics"):
+            key_metrics = self.calculate_metrics(large_dataset)
+        with span("summarization.sample"):
+            sample_records = self.get_sample_data(large_dataset)
         summary = {
             "total_records": len(large_dataset) if hasattr(large_dataset, '__len__') else 1,
-            "key_metrics": self.calculate_metrics(large_dataset),
-            "sample_records": self.get_sample_data(large_dataset),
+            "key_metrics": key_metrics,
+            "sample_records": sample_records,
             "data_type": type(large_dataset).__name__
         }
         return summary
     
-    def process_with_summarization(self, data):
+    def process_with_summarization(self, data, profile=None):
         """Process data using summarization approach"""
-        if len(str(data)) > 500:  # If data is considered large
+        with span("summarization.render"):
+            size = profile.size if profile is not None else len(str(data))
+        if size > 500:  # If data is considered large
             summary = self.summarize_data(data)
             return {
                 "method": "summarization",
                 "summary": summary,
-                "original_size": len(str(data)),
+                "original_size": size,
                 "compressed": True
             }
         else:
             return {
                 "method": "direct_processing",
                 "data": data,
-                "original_size": len(str(data)),
+                "original_size": size,
                 "compressed": False
             }
\ No newline at end of file
@@ -2,18 +2,40 @@ import hashlib
 import json
 import os
 
+try:
+    from ..utils.instrumentation import span
+    from ..utils.spill import json_default
+except ImportError:
+    from utils.instrumentation import span
+    from utils.spill import json_default
+
 class ReferenceBasedProcessor:
+    # Results point into storage_dir, so a cached result cannot stand in for writing the data
+    cacheable = False
+    
     def __init__(self, storage_dir="data_storage"):
+        # The directory is created on first write, not when the processor is built
         self.storage_dir = storage_dir
-        os.makedirs(storage_dir, exist_ok=True)
     
-    def save_to_storage(self, data):
+    def save_to_storage(self, data, data_id=None):
         """Save data to storage and return reference ID"""
-        data_id = hashlib.md5(str(data).encode()).hexdigest()[:8]
+        if data_id is None:
+            data_id = hashlib.md5(str(data).encode()).hexdigest()[:8]
         file_path = os.path.join(self.storage_dir, f"{data_id}.json")
+        # Unique per writer, so concurrent saves of the same data_id never share a temp file
+        temp_path = f"{file_path}.{os.getpid()}-{os.urandom(8).hex()}.tmp"
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, default=str)
+        # Write to a temporary file first so a crash never leaves a partial file
+        with span("reference.storage_write"):
+            os.makedirs(self.storage_dir, exist_ok=True)
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, default=json_default)
+                os.replace(temp_path, file_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
         
         return data_id
     
@@ -22,28 +44,42 @@ class ReferenceBasedProcessor:
         file_path = os.path.join(self.storage_dir, f"{data_id}.json")
         
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("reference.storage_read"):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
         return None
     
-    def create_data_reference(self, large_data):
+    def delete_from_storage(self, data_id):
+        """Remove stored data; unknown reference IDs are ignored"""
+        try:
+            os.remove(os.path.join(self.storage_dir, f"{data_id}.json"))
+        except FileNotFoundError:
+            pass
+    
+    def create_data_reference(self, large_data, text=None):
         """Create a reference to large data"""
-        data_id = self.save_to_storage(large_data)
+        data_id = None
+        if text is not None:
+            # Reuse an already rendered string form for the content hash
+            data_id = hashlib.md5(text.encode()).hexdigest()[:8]
+        data_id = self.save_to_storage(large_data, data_id)
         return f"Data reference ID: {data_id}"
     
-    def process_with_reference(self, data):
+    def process_with_reference(self, data, profile=None):
         """Process data using reference-based approach"""
-        if len(str(data)) > 1000:  # If data is large
-            reference = self.create_data_reference(data)
+        with span("reference.render"):
+            text = profile.text if profile is not None else str(data)
+        if len(text) > 1000:  # If data is large
+            reference = self.create_data_reference(data, text)
             return {
                 "method": "reference_based",
                 "reference": reference,
-                "data_size": len(str(data)),
+                "data_size": len(text),
                 "summary": f"Large data stored with reference"
             }
         else:
             return {
                 "method": "direct_processing",
                 "data": data,
-                "data_size": len(str(data))
+                "data_size": len(text)
             }
\ No newline at end of file
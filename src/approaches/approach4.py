@@ -1,13 +1,20 @@
+try:
+    from ..utils.instrumentation import span
+    from ..utils.spill import spillable_list
+except ImportError:
+    from utils.instrumentation import span
+    from utils.spill import spillable_list
+
 class HierarchicalProcessor:
     def __init__(self):
         pass
     
-    def analyze_overview(self, data):
+    def analyze_overview(self, data, profile=None):
         """Perform high-level analysis of data"""
         overview = {
             "data_type": type(data).__name__,
-            "size": len(str(data)),
-            "important_sections": []
+            "size": profile.size if profile is not None else len(str(data)),
+            "important_sections": spillable_list()
         }
         
         if isinstance(data, list):
@@ -19,6 +26,15 @@ class HierarchicalProcessor:
                         "size": len(str(item)),
                         "type": type(item).__name__
                     })
+        elif isinstance(data, str) and profile is not None:
+            # Paragraph offsets avoid copying every paragraph out of the text
+            for i, (start, end) in enumerate(profile.paragraph_offsets):
+                if end - start > 200:
+                    overview["important_sections"].append({
+                        "index": i,
+                        "size": end - start,
+                        "preview": data[start:start + 50] + "..."
+                    })
         elif isinstance(data, str):
             # Split into paragraphs and identify important ones
             paragraphs = data.split('\n\n')
@@ -41,16 +57,18 @@ class HierarchicalProcessor:
             "complexity": "high" if section_info.get("size", 0) > 500 else "medium"
         }
     
-    def process_hierarchically(self, data):
+    def process_hierarchically(self, data, profile=None):
         """Process data in hierarchical stages"""
         # Stage 1: High-level analysis
-        overview = self.analyze_overview(data)
+        with span("hierarchical.overview"):
+            overview = self.analyze_overview(data, profile)
         
         # Stage 2: Detailed analysis on important sections
-        detailed_results = []
-        for section in overview["important_sections"]:
-            detailed_result = self.analyze_detail(section)
-            detailed_results.append(detailed_result)
+        with span("hierarchical.detail"):
+            detailed_results = spillable_list()
+            for section in overview["important_sections"]:
+                detailed_result = self.analyze_detail(section)
+                detailed_results.append(detailed_result)
         
         return {
             "method": "hierarchical",
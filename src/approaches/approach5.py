@@ -1,3 +1,18 @@
+from itertools import chain, islice, repeat
+
+try:
+    from ..utils.instrumentation import span
+    from ..utils.spill import spillable_list
+except ImportError:
+    from utils.instrumentation import span
+    from utils.spill import spillable_list
+
+
+def _truncate_batch(processor, documents):
+    """Truncate a batch of documents in a worker process with a pickled copy of the processor"""
+    return [processor.process_with_truncation(doc) for doc in documents]
+
+
 class TokenAwareTruncationProcessor:
     def __init__(self, max_tokens=4000):
         self.max_tokens = max_tokens
@@ -6,13 +21,9 @@ class TokenAwareTruncationProcessor:
         """Simple token counting (word-based approximation)"""
         return len(str(text).split())
     
-    def smart_truncate(self, text, max_tokens=None):
-        """Truncate text while preserving important information"""
+    def truncate_tokens(self, tokens, max_tokens=None):
+        """Build the truncated text from an already tokenized document"""
         max_tokens = max_tokens or self.max_tokens
-        tokens = str(text).split()
-        
-        if len(tokens) <= max_tokens:
-            return text
         
         # Keep beginning and end, summarize middle
         start_tokens = max_tokens // 3
@@ -24,13 +35,26 @@ class TokenAwareTruncationProcessor:
         
         return f"{start}\n{middle_summary}\n{end}"
     
-    def process_with_truncation(self, data):
+    def smart_truncate(self, text, max_tokens=None):
+        """Truncate text while preserving important information"""
+        max_tokens = max_tokens or self.max_tokens
+        tokens = str(text).split()
+        
+        if len(tokens) <= max_tokens:
+            return text
+        
+        return self.truncate_tokens(tokens, max_tokens)
+    
+    def process_with_truncation(self, data, profile=None):
         """Process data with smart truncation"""
-        text = str(data)
-        token_count = self.count_tokens(text)
+        # Tokenize once and reuse the tokens for both counting and truncation
+        with span("truncation.tokenize"):
+            tokens = profile.tokens if profile is not None else str(data).split()
+        token_count = len(tokens)
         
         if token_count > self.max_tokens:
-            truncated = self.smart_truncate(text)
+            with span("truncation.truncate"):
+                truncated = self.truncate_tokens(tokens)
             return {
                 "method": "token_aware_truncation",
                 "original_tokens": token_count,
@@ -44,4 +68,48 @@ class TokenAwareTruncationProcessor:
                 "tokens": token_count,
                 "data": data,
                 "truncated": False
-            }
\ No newline at end of file
+            }
+    
+    def process_many_with_truncation(self, documents, workers=None, batch_size=256):
+        """Truncate many documents in one call, optionally across a process pool of copies of this processor.
+        
+        Whitespace tokenization leaves no per-document work to share, so the
+        serial path is the per-document loop streamed over `documents`; the
+        speedup comes from `workers` > 1, used once there is more than one batch.
+        """
+        documents = iter(documents)
+        batches = iter(lambda: list(islice(documents, batch_size)), [])
+        # A pool only pays off with more than one batch, so look at most two batches ahead
+        leading = list(islice(batches, 2)) if workers and workers > 1 else []
+        
+        if len(leading) == 2:
+            # Kept off the import path: most callers never start a pool
+            from concurrent.futures import ProcessPoolExecutor
+            
+            results = spillable_list()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for batch_results in pool.map(_truncate_batch, repeat(self), chain(leading, batches)):
+                    results.extend(batch_results)
+        else:
+            results = spillable_list(self.process_with_truncation(doc) for doc in chain(*leading, documents))
+        
+        original_tokens = 0
+        output_tokens = 0
+        truncated_documents = 0
+        for result in results:
+            if result["truncated"]:
+                truncated_documents += 1
+                original_tokens += result["original_tokens"]
+                output_tokens += result["truncated_tokens"]
+            else:
+                original_tokens += result["tokens"]
+                output_tokens += result["tokens"]
+        
+        return {
+            "method": "batch_token_aware_truncation",
+            "total_documents": len(results),
+            "truncated_documents": truncated_documents,
+            "original_tokens": original_tokens,
+            "output_tokens": output_tokens,
+            "results": results
+        }
\ No newline at end of file
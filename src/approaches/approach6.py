@@ -1,3 +1,75 @@
+import asyncio
+import hashlib
+from collections import deque
+from collections.abc import Iterator
+from itertools import islice
+
+try:
+    from ..utils.instrumentation import span
+    from ..utils.dedup import MinHashDeduplicator
+    from ..utils.spill import spillable_list
+except ImportError:
+    from utils.instrumentation import span
+    from utils.dedup import MinHashDeduplicator
+    from utils.spill import spillable_list
+
+
+class RollingContext:
+    """Bounded window of recent context words with amortized O(1) append and evict.
+    
+    str() and len() match the string update_context would build: each result
+    adds a newline plus its text, and trimming re-joins the kept words with
+    spaces. Only len() is kept up to date; the string is built on demand.
+    """
+    
+    def __init__(self, context_limit=1000):
+        self.context_limit = context_limit
+        self.max_words = context_limit // 5  # Rough word limit
+        self.words = deque()
+        self.tail = []  # texts appended since the last trim, rendered as is
+        self.tail_words = 0
+        self.joined_length = 0  # length of all the words joined with spaces
+        self.length = 0
+    
+    def append(self, new_result):
+        """Add a result to the context and evict the oldest words past the limit"""
+        text = str(new_result)
+        words = text.split()
+        for word in words:
+            self.joined_length += len(word) + (1 if self.words else 0)
+            self.words.append(word)
+        self.tail.append(text)
+        self.tail_words += len(words)
+        self.length += 1 + len(text)
+        
+        if self.length > self.context_limit and len(self.words) > self.max_words:
+            # Keep only the latest part of the context (update_context's words[-0:] keeps them all)
+            keep = self.max_words or len(self.words)
+            while len(self.words) > keep:
+                word = self.words.popleft()
+                self.joined_length -= len(word) + (1 if self.words else 0)
+            self.tail = []
+            self.tail_words = 0
+            self.length = self.joined_length
+    
+    def restore(self, words, tail=()):
+        """Replace the context with previously saved words and texts appended since the last trim"""
+        self.words = deque(words)
+        self.tail = list(tail)
+        self.tail_words = sum(len(text.split()) for text in self.tail)
+        self.joined_length = sum(len(word) for word in self.words) + max(len(self.words) - 1, 0)
+        head = len(self.words) - self.tail_words
+        head_length = sum(len(word) for word in islice(self.words, head)) + max(head - 1, 0)
+        self.length = head_length + sum(1 + len(text) for text in self.tail)
+    
+    def __len__(self):
+        return self.length
+    
+    def __str__(self):
+        head = ' '.join(islice(self.words, len(self.words) - self.tail_words))
+        return head + ''.join(f"\n{text}" for text in self.tail)
+
+
 class StreamingProcessor:
     def __init__(self, context_limit=1000):
         self.context_limit = context_limit
@@ -15,6 +87,15 @@ class StreamingProcessor:
         
         return updated
     
+    def context_argument(self, context):
+        """The RollingContext itself for the built-in process_with_context, which only needs len().
+        
+        Overrides written against the original contract get it rendered to a str.
+        """
+        if type(self).process_with_context is StreamingProcessor.process_with_context:
+            return context
+        return str(context)
+    
     def process_with_context(self, data_chunk, context):
         """Process a single chunk with accumulated context"""
         return {
@@ -26,7 +107,21 @@ class StreamingProcessor:
     
     def create_data_stream(self, large_data, chunk_size=100):
         """Convert large data into a stream of chunks"""
-        if isinstance(large_data, list):
+        if hasattr(large_data, 'read'):
+            # File objects (including sys.stdin) are read incrementally
+            while True:
+                chunk = large_data.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        elif isinstance(large_data, Iterator):
+            # Arbitrary iterators are grouped into lists without materializing them
+            while True:
+                chunk = list(islice(large_data, chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+        elif isinstance(large_data, list):
             for i in range(0, len(large_data), chunk_size):
                 yield large_data[i:i + chunk_size]
         elif isinstance(large_data, str):
@@ -38,21 +133,226 @@ class StreamingProcessor:
             for i in range(0, len(data_str), chunk_size):
                 yield data_str[i:i + chunk_size]
     
-    def iterative_processing(self, data):
-        """Process data incrementally with streaming"""
-        data_stream = self.create_data_stream(data)
-        accumulated_context = ""
-        results = []
+    def stream_processing(self, data, chunk_size=100, context=None, deduplicator=None):
+        """Yield each chunk result as soon as it is produced"""
+        accumulated_context = context if context is not None else RollingContext(self.context_limit)
         
-        for i, data_chunk in enumerate(data_stream):
-            result = self.process_with_context(data_chunk, accumulated_context)
+        for i, data_chunk in enumerate(self.create_data_stream(data, chunk_size)):
+            duplicate = self.check_duplicate(deduplicator, i, data_chunk)
+            if duplicate is not None:
+                yield duplicate
+                continue
+            result = self.process_with_context(data_chunk, self.context_argument(accumulated_context))
             result["chunk_index"] = i
-            accumulated_context = self.update_context(accumulated_context, result)
-            results.append(result)
+            accumulated_context.append(result)
+            yield result
+    
+    def check_duplicate(self, deduplicator, index, data_chunk):
+        """Result for a near-duplicate chunk (skipped, context untouched), or None to process it"""
+        if deduplicator is None:
+            return None
+        with span("streaming.dedup"):
+            duplicate = deduplicator.check(index, data_chunk)
+        return {"chunk_index": index, **duplicate} if duplicate is not None else None
+    
+    def iterative_processing(self, data, chunk_size=100, checkpoint_store=None, checkpoint_id=None,
+                             checkpoint_interval=100, profile=None, dedup=False, dedup_threshold=0.9):
+        """Process data incrementally with streaming.
+        
+        With `dedup=True`, near-duplicate chunks (MinHash similarity >=
+        `dedup_threshold`) are not processed and do not update the context;
+        their results record "duplicate_of" and "similarity".
+        """
+        if profile is not None and not isinstance(data, (list, str, Iterator)) and not hasattr(data, 'read'):
+            # Stream the already rendered string form instead of rendering again
+            data = profile.text
+        deduplicator = MinHashDeduplicator(dedup_threshold) if dedup else None
+        if checkpoint_store is not None:
+            result = self.resume_processing(data, checkpoint_store, checkpoint_id, checkpoint_interval,
+                                            chunk_size=chunk_size, resume=False, deduplicator=deduplicator)
+        else:
+            accumulated_context = RollingContext(self.context_limit)
+            with span("streaming.process_chunks"):
+                results = spillable_list(self.stream_processing(data, chunk_size, context=accumulated_context,
+                                                                deduplicator=deduplicator))
+            
+            result = {
+                "method": "streaming_iterative",
+                "total_chunks": len(results),
+                "final_context_length": len(accumulated_context),
+                "chunk_results": results
+            }
+        if deduplicator is not None:
+            result["dedup"] = deduplicator.report()
+        return result
+    
+    def default_checkpoint_id(self, data):
+        """Checkpoint ID derived from the content hash, so unrelated inputs never share checkpoints"""
+        if isinstance(data, Iterator) or hasattr(data, 'read'):
+            raise ValueError("checkpoint_id is required for iterators and file objects (their content "
+                             "cannot be hashed before it is read)")
+        digest = hashlib.sha256(type(data).__name__.encode())
+        digest.update(str(data).encode('utf-8', 'surrogatepass'))
+        return f"stream-{digest.hexdigest()[:16]}"
+    
+    def update_input_digest(self, digest, data_chunk):
+        """Fold a chunk into the running digest that ties a checkpoint to its input"""
+        text = str(data_chunk).encode('utf-8', 'surrogatepass')
+        digest.update(f"{len(text)}:".encode())
+        digest.update(text)
+    
+    def save_checkpoint(self, checkpoint_store, checkpoint_id, state, context, new_results):
+        """Persist results since the last checkpoint, then the stream state"""
+        # Results go into their own segment so each checkpoint only writes new results
+        checkpoint_store.save_to_storage(new_results, f"{checkpoint_id}-results-{state['segments']}")
+        state["segments"] += 1
+        state["next_chunk"] += len(new_results)
+        state["context"] = list(context.words)
+        state["context_tail"] = list(context.tail)
+        # The state file is replaced atomically and only ever points at complete segments
+        checkpoint_store.save_to_storage(state, f"{checkpoint_id}-checkpoint")
+    
+    def resume_processing(self, data, checkpoint_store, checkpoint_id=None, checkpoint_interval=100,
+                          chunk_size=100, resume=True, deduplicator=None):
+        """Process data with periodic checkpoints, resuming from the last one if present.
+        
+        A crash repeats the processing of at most `checkpoint_interval` chunks;
+        chunks covered by the checkpoint are re-read from the source and skipped
+        (with a deduplicator, their representatives are re-indexed). The
+        checkpoint stores a digest of the chunks it covers, and resuming with
+        different input raises ValueError. `checkpoint_id` defaults to one
+        derived from the content hash; iterators and file objects need an
+        explicit ID.
+        """
+        if checkpoint_id is None:
+            checkpoint_id = self.default_checkpoint_id(data)
+        state = checkpoint_store.load_from_storage(f"{checkpoint_id}-checkpoint") if resume else None
+        if state is None:
+            state = {"next_chunk": 0, "segments": 0, "context": [], "completed": False, "input_digest": None}
+        resumed_from = state["next_chunk"]
+        accumulated_context = RollingContext(self.context_limit)
+        accumulated_context.restore(state["context"], state.get("context_tail", ()))
+        
+        results = spillable_list()
+        for segment in range(state["segments"]):
+            results.extend(checkpoint_store.load_from_storage(f"{checkpoint_id}-results-{segment}"))
+        
+        data_stream = self.create_data_stream(data, chunk_size)
+        digest = hashlib.sha256()
+        # Chunks already covered by the checkpoint are re-read (not processed) to check the input matches
+        for i, data_chunk in enumerate(islice(data_stream, resumed_from)):
+            self.update_input_digest(digest, data_chunk)
+            if deduplicator is not None and "duplicate_of" not in results[i]:
+                deduplicator.add(i, data_chunk)
+        stale = resumed_from > 0 and digest.hexdigest() != state.get("input_digest")
+        if stale or (state["completed"] and next(data_stream, None) is not None):
+            raise ValueError(f"Checkpoint {checkpoint_id!r} was written for different input")
+        
+        if not state["completed"]:
+            new_results = []
+            for i, data_chunk in enumerate(data_stream, start=resumed_from):
+                self.update_input_digest(digest, data_chunk)
+                result = self.check_duplicate(deduplicator, i, data_chunk)
+                if result is None:
+                    result = self.process_with_context(data_chunk, self.context_argument(accumulated_context))
+                    result["chunk_index"] = i
+                    accumulated_context.append(result)
+                new_results.append(result)
+                
+                if len(new_results) >= checkpoint_interval:
+                    state["input_digest"] = digest.hexdigest()
+                    self.save_checkpoint(checkpoint_store, checkpoint_id, state, accumulated_context, new_results)
+                    results.extend(new_results)
+                    new_results = []
+            
+            state["completed"] = True
+            state["input_digest"] = digest.hexdigest()
+            self.save_checkpoint(checkpoint_store, checkpoint_id, state, accumulated_context, new_results)
+            results.extend(new_results)
         
         return {
             "method": "streaming_iterative",
             "total_chunks": len(results),
             "final_context_length": len(accumulated_context),
+            "chunk_results": results,
+            "resumed_from_chunk": resumed_from
+        }
+
+class AsyncStreamingProcessor(StreamingProcessor):
+    def __init__(self, context_limit=1000, concurrency=4, max_pending=None, chunk_handler=None):
+        super().__init__(context_limit)
+        self.concurrency = concurrency
+        # Bound on chunks read ahead of the one being emitted (backpressure)
+        self.max_pending = max_pending or concurrency * 2
+        self.chunk_handler = chunk_handler
+    
+    async def prepare_chunk(self, data_chunk):
+        """Run the I/O-bound part of chunk processing (runs concurrently across chunks)"""
+        if self.chunk_handler is not None:
+            return await self.chunk_handler(data_chunk)
+        return data_chunk
+    
+    async def create_async_data_stream(self, large_data, chunk_size=100):
+        """Convert sync or async data sources into an async stream of chunks"""
+        if hasattr(large_data, '__aiter__'):
+            chunk = []
+            async for item in large_data:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        else:
+            for chunk in self.create_data_stream(large_data, chunk_size):
+                yield chunk
+    
+    async def astream_processing(self, data, chunk_size=100, context=None):
+        """Yield chunk results in order while preparing up to `concurrency` chunks at once"""
+        accumulated_context = context if context is not None else RollingContext(self.context_limit)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = deque()
+        index = 0
+        
+        async def prepare(data_chunk):
+            async with semaphore:
+                return await self.prepare_chunk(data_chunk)
+        
+        def finish(prepared, i):
+            # Context-dependent work runs in chunk order, after all earlier chunks
+            result = self.process_with_context(prepared, self.context_argument(accumulated_context))
+            result["chunk_index"] = i
+            accumulated_context.append(result)
+            return result
+        
+        try:
+            async for data_chunk in self.create_async_data_stream(data, chunk_size):
+                pending.append(asyncio.ensure_future(prepare(data_chunk)))
+                if len(pending) >= self.max_pending:
+                    yield finish(await pending.popleft(), index)
+                    index += 1
+            
+            while pending:
+                yield finish(await pending.popleft(), index)
+                index += 1
+        finally:
+            # After a failure (or early close) stop the chunks prepared ahead and retrieve
+            # their outcomes, so nothing keeps running or logs "exception was never retrieved"
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def aiterative_processing(self, data, chunk_size=100):
+        """Async counterpart of iterative_processing"""
+        accumulated_context = RollingContext(self.context_limit)
+        results = []
+        async for result in self.astream_processing(data, chunk_size, context=accumulated_context):
+            results.append(result)
+        
+        return {
+            "method": "streaming_async",
+            "total_chunks": len(results),
+            "final_context_length": len(accumulated_context),
             "chunk_results": results
-        }
\ No newline at end of file
+        }
@@ -1,5 +1,13 @@
 import sys
 import os
+import json
+import time
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from itertools import islice
 
 # Add the src directory to the Python path to ensure imports work
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -7,21 +15,22 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, current_dir)
 sys.path.insert(0, parent_dir)
 
+# Approach modules, heavier project modules (shared memory, pipelines,
+# calibration) and process pools load on first use; other standard library
+# modules are imported up front.
 try:
-    from approaches import (
-        ChunkingProcessor,
-        SummarizationProcessor,
-        ReferenceBasedProcessor,
-        HierarchicalProcessor,
-        TokenAwareTruncationProcessor,
-        StreamingProcessor
-    )
+    from registry import ProcessorRegistry, LazyProcessors
     from utils import (
         format_result_output,
         validate_data_input,
         get_data_characteristics,
-        save_results_to_file,
-        load_sample_data
+        load_sample_data,
+        DataProfile,
+        span,
+        recording,
+        spilling,
+        spillable_list,
+        MemoryBudget
     )
 except ImportError as e:
     print(f"Import error: {e}")
@@ -34,53 +43,459 @@ except ImportError as e:
         print("Files in utils directory:", os.listdir('utils'))
     raise
 
+# Processing method installed once per worker process by process_many
+_worker_method = None
+
+def _init_worker(method):
+    global _worker_method
+    _worker_method = method
+
+def _process_document(method, document):
+    """Process one document, reporting failures as error results"""
+    from utils.transport import PayloadHandle, read_payload
+    
+    if isinstance(document, PayloadHandle):
+        document = read_payload(document)
+    if not validate_data_input(document):
+        return {"error": "Invalid data input"}
+    try:
+        return method(document)
+    except Exception as e:
+        return {"error": str(e)}
+
+def _run_within_budget(budget, method, data, profile):
+    """Run an approach method with a memory budget active (budgets do not cross threads on their own)"""
+    with spilling(budget):
+        return method(data, profile=profile)
+
+def _take_batch(indexed, batch_size, max_batch_chars):
+    """Next batch of (index, document) pairs, closed early once its str/bytes documents reach max_batch_chars"""
+    if max_batch_chars is None:
+        return list(islice(indexed, batch_size))
+    batch = []
+    chars = 0
+    for index, document in islice(indexed, batch_size):
+        batch.append((index, document))
+        if isinstance(document, (str, bytes)):
+            chars += len(document)
+        if chars >= max_batch_chars:
+            break
+    return batch
+
+class _WithoutProfile:
+    """Adapts a processing method without a `profile` parameter (e.g. a plugin's process(self, data))"""
+    
+    def __init__(self, method):
+        self.method = method
+    
+    def __call__(self, data, profile=None):
+        return self.method(data)
+
+# Code flag of functions taking **kwargs (inspect.CO_VARKEYWORDS, without importing inspect)
+_CO_VARKEYWORDS = 0x08
+
+def _accepts_profile(method):
+    """Whether a processing method takes a `profile` keyword (assumed when its signature is unavailable)"""
+    code = getattr(getattr(method, "__func__", method), "__code__", None)
+    if code is not None:
+        names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+        return "profile" in names or bool(code.co_flags & _CO_VARKEYWORDS)
+    
+    # Other callables (partials, callable objects) are rare enough to pay for inspect
+    import inspect
+    
+    try:
+        parameters = inspect.signature(method).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(parameter.name == "profile" or parameter.kind is parameter.VAR_KEYWORD for parameter in parameters)
+
+def _process_batch(batch):
+    """Process a batch of (index, document) pairs in a worker process"""
+    return [(index, _process_document(_worker_method, document)) for index, document in batch]
+
 class DataProcessingManager:
-    def __init__(self):
-        self.processors = {
-            'chunking': ChunkingProcessor(),
-            'summarization': SummarizationProcessor(),
-            'reference': ReferenceBasedProcessor(),
-            'hierarchical': HierarchicalProcessor(),
-            'truncation': TokenAwareTruncationProcessor(),
-            'streaming': StreamingProcessor()
-        }
+    def __init__(self, cache=None, cost_model=None, instrumentation_hooks=None, registry=None,
+                 memory_budget=None, spill_dir=None):
+        # Optional ResultCache shared by process_with_approach and process_with_all_approaches
+        self.cache = cache
+        # Optional CostModel (see calibrate_cost_model) used for budget-aware recommendations
+        self.cost_model = cost_model
+        # Callables receiving each span record when a call runs with instrument=True
+        self.instrumentation_hooks = list(instrumentation_hooks or [])
+        # Approaches are looked up in the registry and their processors built on first use
+        self.registry = registry or ProcessorRegistry()
+        self.processors = LazyProcessors(self.registry)
+        # Optional bound in bytes on growing intermediates; the excess spills to reference storage
+        self.spill_dir = spill_dir
+        self.memory_budget = self.create_memory_budget(memory_budget) if memory_budget is not None else None
+    
+    def create_memory_budget(self, limit_bytes):
+        """MemoryBudget spilling to a ReferenceBasedProcessor store under spill_dir (default: a temp dir)"""
+        from approaches.approach3 import ReferenceBasedProcessor
+        
+        storage_dir = self.spill_dir or tempfile.mkdtemp(prefix="spill-")
+        budget = MemoryBudget(limit_bytes, ReferenceBasedProcessor(storage_dir=storage_dir))
+        if self.spill_dir is None:
+            # Spilled lists keep the budget alive, so the directory outlives every result using it
+            weakref.finalize(budget, shutil.rmtree, storage_dir, True)
+        return budget
     
-    def process_with_approach(self, data, approach_name):
-        """Process data using specified approach"""
+    def _resolve_memory_budget(self, memory_budget):
+        """Budget for one call: `memory_budget` bytes if given, else fresh accounting under the manager's limit"""
+        if memory_budget is not None:
+            return self.create_memory_budget(memory_budget)
+        if self.memory_budget is not None:
+            # Lists still held from earlier calls must not count against (or be reported by) this one
+            return self.memory_budget.for_call()
+        return None
+    
+    def get_approach_method(self, approach_name):
+        """Get the bound processing method for an approach"""
+        if approach_name not in self.registry:
+            raise ValueError(f"Unknown approach: {approach_name}. Available: {self.get_available_approaches()}")
+        
+        processor = self.processors[approach_name]
+        method = getattr(processor, self.registry.method_name(approach_name))
+        # The manager passes profile= to share its DataProfile; methods without one get only the data
+        return method if _accepts_profile(method) else _WithoutProfile(method)
+    
+    def process_with_approach(self, data, approach_name, profile=None, instrument=False, trace_memory=False,
+                              memory_budget=None):
+        """Process data using specified approach.
+        
+        With `instrument=True` the result is a copy carrying an "instrumentation"
+        entry with per-stage wall/CPU time and allocation counts (plus peak
+        memory via tracemalloc when `trace_memory=True`).
+        
+        While a memory budget is active (`memory_budget` bytes for this call, or
+        the manager's), growing intermediates such as chunk_results spill to
+        reference storage once over budget and come back as lazily reloading
+        SpilledLists; the result then carries a "memory_budget" report for
+        this call. Such results bypass the cache, since their SpilledLists
+        belong to the call's budget and spill storage.
+        """
+        budget = self._resolve_memory_budget(memory_budget)
+        use_cache = budget is None
+        with spilling(budget):
+            if not instrument:
+                result = self._process_with_approach(data, approach_name, profile, use_cache)
+            else:
+                with recording(trace_memory, self.instrumentation_hooks) as recorder:
+                    with span(f"{approach_name}.total"):
+                        result = self._process_with_approach(data, approach_name, profile, use_cache)
+                # Copy so instrumentation never leaks into cached results
+                result = {**result, "instrumentation": recorder.as_dict()}
+        
+        if budget is not None:
+            result = {**result, "memory_budget": budget.report()}
+        return result
+    
+    def _process_with_approach(self, data, approach_name, profile=None, use_cache=True):
         if not validate_data_input(data):
             raise ValueError("Invalid data input")
-            
-        if approach_name not in self.processors:
-            raise ValueError(f"Unknown approach: {approach_name}. Available: {list(self.processors.keys())}")
         
+        method = self.get_approach_method(approach_name)
+        if self.cache is None or not use_cache:
+            return method(data, profile=profile)
+        
+        with span("manager.profile"):
+            profile = profile or DataProfile(data)
+            key = self.cache_key(profile, approach_name)
+        if key is None:
+            return method(data, profile=profile)
+        with span("manager.cache_lookup"):
+            result = self.cache.get(key)
+        if result is None:
+            result = method(data, profile=profile)
+            self.cache.put(key, result)
+        return result
+    
+    def cache_key(self, profile, approach_name):
+        """Cache key for a profiled datum under an approach and its processor configuration.
+        
+        None when the result must not be cached: the data's string form does not
+        identify it (see DataProfile.cacheable), or the processor sets
+        `cacheable = False` because calls have side effects a hit would skip.
+        """
         processor = self.processors[approach_name]
+        if not getattr(processor, 'cacheable', True) or not profile.cacheable:
+            return None
+        return self.cache.make_key(profile.content_hash, approach_name, processor)
+    
+    def approach_stage(self, approach_name, workers=1, executor="thread"):
+        """Wrap an approach as a pipeline stage"""
+        from pipeline import Stage
         
-        # Method mapping for cleaner code
-        method_mapping = {
-            'chunking': processor.process_large_data_in_chunks,
-            'summarization': processor.process_with_summarization,
-            'reference': processor.process_with_reference,
-            'hierarchical': processor.process_hierarchically,
-            'truncation': processor.process_with_truncation,
-            'streaming': processor.iterative_processing
-        }
+        return Stage(self.get_approach_method(approach_name), workers=workers, executor=executor,
+                     name=approach_name)
+    
+    def create_pipeline(self, stages, queue_size=16):
+        """Compose stages (approach names or Stage objects) into a concurrent pipeline"""
+        from pipeline import Pipeline
         
-        return method_mapping[approach_name](data)
+        return Pipeline(
+            [self.approach_stage(stage) if isinstance(stage, str) else stage for stage in stages],
+            queue_size=queue_size
+        )
     
-    def process_with_all_approaches(self, data):
-        """Process data with all available approaches"""
+    def process_with_all_approaches(self, data, workers=None, timeout=None, executor="thread", memory_budget=None):
+        """Process data with all available approaches concurrently.
+        
+        The input is validated and profiled once, and the shared profile is
+        handed to every approach. `timeout` bounds each approach in seconds;
+        approaches that run over are reported as errors. Approaches are
+        submitted only as workers free up, so each one's clock starts when it
+        starts running and approaches queued behind `workers` busy ones keep
+        their full budget. An approach that times out keeps running in the
+        background, and its worker takes no other approach until it finishes.
+        With the
+        thread executor all approaches share one memory budget for the call
+        and bypass the cache while it is active; worker processes are not
+        budgeted.
+        """
         if not validate_data_input(data):
             return {"error": "Invalid data input"}
-            
+        
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}. Available: ['thread', 'process']")
+        
+        profile = DataProfile(data)
+        approach_names = self.get_available_approaches()
+        budget = self._resolve_memory_budget(memory_budget) if executor == "thread" else None
+        if executor == "thread":
+            pool_class = ThreadPoolExecutor
+        else:
+            from concurrent.futures import ProcessPoolExecutor as pool_class
+        workers = workers or len(approach_names)
+        pool = pool_class(max_workers=workers)
+        
         results = {}
-        for approach_name in self.processors.keys():
+        cache_keys = {}
+        if self.cache is not None and budget is None:
+            for approach_name in approach_names:
+                cache_keys[approach_name] = self.cache_key(profile, approach_name)
+                if cache_keys[approach_name] is None:
+                    continue
+                cached = self.cache.get(cache_keys[approach_name])
+                if cached is not None:
+                    results[approach_name] = cached
+        
+        try:
+            queued = deque(approach_name for approach_name in approach_names if approach_name not in results)
+            pending = {}
+            deadlines = {}
+            # Futures holding a worker, including timed-out ones that are still running
+            busy = set()
+            while queued or pending:
+                # Submit only to free workers: a process pool reports queued calls as running,
+                # so this is what makes each approach's clock start when it really starts
+                busy = {future for future in busy if not future.done()}
+                while queued and len(busy) < workers:
+                    approach_name = queued.popleft()
+                    pending[approach_name] = pool.submit(_run_within_budget, budget,
+                                                         self.get_approach_method(approach_name), data, profile)
+                    busy.add(pending[approach_name])
+                    if timeout is not None:
+                        deadlines[approach_name] = time.monotonic() + timeout
+                
+                now = time.monotonic()
+                for approach_name in [name for name in pending if name in deadlines and deadlines[name] <= now]:
+                    if not pending[approach_name].done():
+                        pending.pop(approach_name).cancel()
+                        results[approach_name] = {"error": f"Timed out after {timeout} seconds"}
+                
+                wait_seconds = None
+                if timeout is not None and pending:
+                    wait_seconds = max(min(deadlines[name] for name in pending) - now, 0)
+                wait(busy, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+                
+                for approach_name in [name for name in pending if pending[name].done()]:
+                    future = pending.pop(approach_name)
+                    try:
+                        results[approach_name] = future.result()
+                        if cache_keys.get(approach_name) is not None:
+                            self.cache.put(cache_keys[approach_name], results[approach_name])
+                    except Exception as e:
+                        results[approach_name] = {"error": str(e)}
+        finally:
+            pool.shutdown(wait=False)
+        return {approach_name: results[approach_name] for approach_name in approach_names}
+    
+    def iter_many(self, documents, approach_name, workers=None, batch_size=32, ordered=True,
+                  shared_memory_threshold=1024 * 1024, max_batch_chars=None):
+        """Yield (index, result) for each document, sharded across a process pool.
+        
+        Documents are sent to workers in batches of `batch_size` to amortize
+        IPC, and at most two batches per worker are in flight or waiting to be
+        yielded, so `documents` can be an arbitrarily long iterator. With
+        `ordered=False` results are yielded as soon as their batch completes;
+        otherwise finished batches wait behind the earliest unfinished one.
+        
+        Memory is bounded in batches, not bytes. When documents vary widely in
+        size, `max_batch_chars` also closes a batch once its str/bytes
+        documents total that many characters (other documents count as zero).
+        
+        str/bytes documents of at least `shared_memory_threshold` characters are
+        placed in shared memory and sent as PayloadHandles instead of being
+        pickled; documents may also be PayloadHandles already (for example
+        from SharedPayload.chunk_handles).
+        """
+        method = self.get_approach_method(approach_name)
+        workers = workers or os.cpu_count() or 1
+        indexed = enumerate(documents)
+        
+        if workers == 1:
+            for index, document in indexed:
+                yield index, _process_document(method, document)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        pending = {}
+        completed = {}
+        # Shared segments stay alive until the batch that uses them completes
+        payloads = {}
+        next_batch = 0
+        next_to_emit = 0
+        exhausted = False
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(method,)) as pool:
             try:
-                results[approach_name] = self.process_with_approach(data, approach_name)
-            except Exception as e:
-                results[approach_name] = {"error": str(e)}
-        return results
+                while pending or not exhausted:
+                    # Buffered out-of-order batches count too, so a slow head batch stops submission
+                    while not exhausted and len(pending) + len(completed) < workers * 2:
+                        batch = _take_batch(indexed, batch_size, max_batch_chars)
+                        if not batch:
+                            exhausted = True
+                            break
+                        if shared_memory_threshold is not None:
+                            batch, payloads[next_batch] = self._share_large_documents(batch, shared_memory_threshold)
+                        pending[pool.submit(_process_batch, batch)] = next_batch
+                        next_batch += 1
+                    
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch_number = pending.pop(future)
+                        for payload in payloads.pop(batch_number, []):
+                            payload.close()
+                        if ordered:
+                            completed[batch_number] = future.result()
+                        else:
+                            yield from future.result()
+                    
+                    # Emit finished batches that are next in input order
+                    while next_to_emit in completed:
+                        yield from completed.pop(next_to_emit)
+                        next_to_emit += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                for batch_payloads in payloads.values():
+                    for payload in batch_payloads:
+                        payload.close()
+    
+    def _share_large_documents(self, batch, threshold):
+        """Swap large str/bytes documents in a batch for shared memory handles"""
+        from utils.transport import SharedPayload
+        
+        shared_batch = []
+        payloads = []
+        for index, document in batch:
+            if isinstance(document, (str, bytes)) and len(document) >= threshold:
+                payloads.append(SharedPayload(document))
+                document = payloads[-1].handle()
+            shared_batch.append((index, document))
+        return shared_batch, payloads
+    
+    def process_many(self, documents, approach_name, workers=None, batch_size=32,
+                     shared_memory_threshold=1024 * 1024, memory_budget=None, max_batch_chars=None):
+        """Process many documents with one approach and report throughput"""
+        start = time.perf_counter()
+        with spilling(self._resolve_memory_budget(memory_budget)):
+            results = spillable_list(result for _, result in self.iter_many(
+                documents, approach_name, workers, batch_size, shared_memory_threshold=shared_memory_threshold,
+                max_batch_chars=max_batch_chars))
+        elapsed = time.perf_counter() - start
+        
+        return {
+            "method": "bulk_processing",
+            "approach": approach_name,
+            "total_documents": len(results),
+            "errors": sum(1 for result in results if "error" in result),
+            "elapsed_seconds": elapsed,
+            "documents_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+            "results": results
+        }
+    
+    def calibrate_cost_model(self, sizes=None, shapes=None, repeats=3, path=None):
+        """Benchmark every approach on this machine and install the fitted cost model"""
+        from approaches.approach3 import ReferenceBasedProcessor
+        from utils.cost_model import calibrate
+        
+        options = {key: value for key, value in (("sizes", sizes), ("shapes", shapes)) if value is not None}
+        # Calibration runs must not leave reference files in the real storage directory
+        storage_dir = tempfile.mkdtemp()
+        original_reference = self.processors['reference']
+        self.processors['reference'] = ReferenceBasedProcessor(storage_dir=storage_dir)
+        try:
+            self.cost_model = calibrate(self.get_approach_method, self.get_available_approaches(),
+                                        repeats=repeats, **options)
+        finally:
+            self.processors['reference'] = original_reference
+            shutil.rmtree(storage_dir, ignore_errors=True)
+        
+        if path is not None:
+            self.cost_model.save(path)
+        return self.cost_model
+    
+    def predict_costs(self, data):
+        """Predicted runtime and peak memory of every approach for this data"""
+        from utils.cost_model import data_shape
+        
+        if self.cost_model is None:
+            raise ValueError("No cost model available - run calibrate_cost_model() or pass cost_model=")
+        size = len(str(data))
+        shape = data_shape(data)
+        return {
+            approach_name: self.cost_model.predict(approach_name, size, shape)
+            for approach_name in self.cost_model.approaches() if approach_name in self.registry
+        }
+    
+    def recommend_with_prediction(self, data, latency_budget=None, memory_budget=None):
+        """Recommend an approach within a latency (seconds) and memory (bytes) budget.
+        
+        The size-based default is kept when it fits the budget; otherwise the
+        fastest approach that fits is chosen, or the fastest overall if none fits.
+        """
+        predictions = self.predict_costs(data)
+        
+        def fits(approach_name):
+            prediction = predictions[approach_name]
+            return ((latency_budget is None or prediction["seconds"] <= latency_budget) and
+                    (memory_budget is None or prediction["peak_bytes"] <= memory_budget))
+        
+        default = self.recommend_approach(data)
+        candidates = [approach_name for approach_name in predictions if fits(approach_name)]
+        if default in candidates:
+            approach = default
+        elif candidates:
+            approach = min(candidates, key=lambda name: predictions[name]["seconds"])
+        else:
+            approach = min(predictions, key=lambda name: predictions[name]["seconds"])
+        
+        return {
+            "approach": approach,
+            "predicted_seconds": predictions[approach]["seconds"],
+            "predicted_peak_bytes": predictions[approach]["peak_bytes"],
+            "fits_budget": fits(approach),
+            "predictions": predictions
+        }
     
-    def recommend_approach(self, data):
+    def recommend_approach(self, data, latency_budget=None, memory_budget=None):
         """Recommend best approach based on data characteristics"""
         try:
             characteristics = get_data_characteristics(data)
@@ -88,7 +503,11 @@ class DataProcessingManager:
             
             if data_size < 500:
                 return "No processing needed - data is small"
-            elif data_size < 2000:
+            
+            if self.cost_model is not None and (latency_budget is not None or memory_budget is not None):
+                return self.recommend_with_prediction(data, latency_budget, memory_budget)["approach"]
+            
+            if data_size < 2000:
                 return "summarization"
             elif data_size < 10000:
                 return "chunking"
@@ -100,11 +519,13 @@ class DataProcessingManager:
     
     def get_available_approaches(self):
         """Get list of available approaches"""
-        return list(self.processors.keys())
+        return self.registry.names()
 
 def main():
     """Main function to demonstrate all approaches"""
     try:
+        from utils.jsonl import JsonlResultWriter
+        
         # Initialize the manager
         manager = DataProcessingManager()
         
@@ -119,39 +540,35 @@ def main():
         print("=== Data Processing Approaches Demo ===\n")
         print(f"Available approaches: {manager.get_available_approaches()}\n")
         
-        all_results = {}
-        
-        for name, data in test_cases:
-            print(f"--- Processing {name} ---")
-            
-            try:
-                characteristics = get_data_characteristics(data)
-                print(f"Data characteristics: {characteristics}")
-                
-                recommendation = manager.recommend_approach(data)
-                print(f"Recommended approach: {recommendation}")
+        # Results are streamed to disk as each one is produced
+        results_path = "processing_results.jsonl"
+        with JsonlResultWriter(results_path) as writer:
+            for name, data in test_cases:
+                print(f"--- Processing {name} ---")
                 
-                # Process with recommended approach
-                if recommendation != "No processing needed - data is small":
-                    result = manager.process_with_approach(data, recommendation)
-                    print(format_result_output(result, recommendation))
-                    all_results[name] = result
-                else:
-                    print("Data is small enough - no processing needed")
-                    all_results[name] = {"method": "no_processing", "reason": "data_too_small"}
+                try:
+                    characteristics = get_data_characteristics(data)
+                    print(f"Data characteristics: {characteristics}")
                     
-            except Exception as e:
-                print(f"Error processing {name}: {str(e)}")
-                all_results[name] = {"error": str(e)}
-            
-            print("-" * 50)
+                    recommendation = manager.recommend_approach(data)
+                    print(f"Recommended approach: {recommendation}")
+                    
+                    # Process with recommended approach
+                    if recommendation != "No processing needed - data is small":
+                        result = manager.process_with_approach(data, recommendation)
+                        print(format_result_output(result, recommendation))
+                        writer.write_result(name, result)
+                    else:
+                        print("Data is small enough - no processing needed")
+                        writer.write_result(name, {"method": "no_processing", "reason": "data_too_small"})
+                        
+                except Exception as e:
+                    print(f"Error processing {name}: {str(e)}")
+                    writer.write_result(name, {"error": str(e)})
+                
+                print("-" * 50)
         
-        # Save results to file
-        if all_results:
-            save_message = save_results_to_file(all_results)
-            print(f"\n{save_message}")
-        else:
-            print("\nNo results to save.")
+        print(f"\nResults saved to {results_path} ({writer.records_written} records)")
             
     except ImportError as e:
         print(f"Import error: {e}")
@@ -181,8 +598,31 @@ def test_single_approach():
     except Exception as e:
         print(f"Error: {e}")
 
+def stream_input(source):
+    """Stream a file object through the streaming processor, printing one JSON result per line"""
+    from approaches.approach6 import StreamingProcessor
+    
+    processor = StreamingProcessor()
+    for result in processor.stream_processing(source):
+        print(json.dumps(result, default=str), flush=True)
+
+def calibrate_command(path="cost_model.json"):
+    """Calibrate the cost model on this machine and save it"""
+    manager = DataProcessingManager()
+    print("Calibrating approaches - this runs each approach over inputs up to 1 MB...")
+    manager.calibrate_cost_model(path=path)
+    print(f"Cost model saved to {path}")
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         test_single_approach()
+    elif len(sys.argv) > 1 and sys.argv[1] == "calibrate":
+        calibrate_command(*sys.argv[2:3])
+    elif len(sys.argv) > 1 and sys.argv[1] == "stream":
+        if len(sys.argv) > 2:
+            with open(sys.argv[2], 'r', encoding='utf-8') as f:
+                stream_input(f)
+        else:
+            stream_input(sys.stdin)
     else:
         main()
\ No newline at end of file
@@ -0,0 +1,129 @@
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_DONE = object()
+
+
+class Stage:
+    """A pipeline step: a callable run by a pool of thread or process workers"""
+
+    def __init__(self, func, workers=1, executor="thread", fan_out=False, name=None):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}. Available: ['thread', 'process']")
+        self.func = func
+        self.workers = workers
+        self.executor = executor
+        # Fan-out stages return an iterable; each item is sent downstream separately
+        self.fan_out = fan_out
+        self.name = name or getattr(func, "__name__", "stage")
+
+
+class Pipeline:
+    """Run stages concurrently, connected by bounded queues.
+
+    Items flow through each stage as soon as they are ready, so at most
+    `queue_size` items wait between any two stages. Output order is only
+    preserved when every stage has a single worker.
+    """
+
+    def __init__(self, stages, queue_size=16):
+        self.stages = list(stages)
+        self.queue_size = queue_size
+
+    def _put(self, q, item, stop):
+        """Block until there is room in the queue or the pipeline is stopped"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q, stop):
+        """Block until an item is available or the pipeline is stopped"""
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, inputs, out_queue, stop, errors):
+        try:
+            for item in inputs:
+                if not self._put(out_queue, item, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            self._put(out_queue, _DONE, stop)
+
+    def _work(self, stage, pool, in_queue, out_queue, stop, errors, remaining, lock):
+        try:
+            while True:
+                item = self._get(in_queue, stop)
+                if item is _DONE:
+                    # Let sibling workers of this stage see the end of input too
+                    self._put(in_queue, _DONE, stop)
+                    break
+
+                if pool is not None:
+                    output = pool.submit(stage.func, item).result()
+                else:
+                    output = stage.func(item)
+
+                outputs = output if stage.fan_out else (output,)
+                for result in outputs:
+                    if not self._put(out_queue, result, stop):
+                        return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last_worker = remaining[0] == 0
+            if last_worker:
+                self._put(out_queue, _DONE, stop)
+
+    def run(self, inputs):
+        """Send inputs through every stage, yielding final outputs as they arrive"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stop = threading.Event()
+        errors = []
+        pools = []
+        threads = [threading.Thread(target=self._feed, args=(iter(inputs), queues[0], stop, errors), daemon=True)]
+
+        for i, stage in enumerate(self.stages):
+            pool = ProcessPoolExecutor(max_workers=stage.workers) if stage.executor == "process" else None
+            if pool is not None:
+                pools.append(pool)
+            remaining, lock = [stage.workers], threading.Lock()
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, pool, queues[i], queues[i + 1], stop, errors, remaining, lock),
+                    name=f"{stage.name}-worker",
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1], stop)
+                if item is _DONE:
+                    break
+                yield item
+            if errors:
+                raise errors[0]
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for pool in pools:
+                pool.shutdown()
@@ -0,0 +1,95 @@
+import importlib
+
+# Entry point group third-party packages use to contribute approaches, e.g. in pyproject.toml:
+#   [project.entry-points."chunking_approaches.processors"]
+#   keywords = "my_package.keywords:KeywordProcessor"
+# The loaded object is called with no arguments to build the processor, and its
+# `process_method` attribute names the processing method (default "process").
+# The method is called as method(data, profile=DataProfile) when it accepts a
+# `profile` parameter (or **kwargs), and as method(data) otherwise.
+ENTRY_POINT_GROUP = "chunking_approaches.processors"
+
+BUILTIN_APPROACHES = {
+    'chunking': ('approaches.approach1:ChunkingProcessor', 'process_large_data_in_chunks'),
+    'summarization': ('approaches.approach2:SummarizationProcessor', 'process_with_summarization'),
+    'reference': ('approaches.approach3:ReferenceBasedProcessor', 'process_with_reference'),
+    'hierarchical': ('approaches.approach4:HierarchicalProcessor', 'process_hierarchically'),
+    'truncation': ('approaches.approach5:TokenAwareTruncationProcessor', 'process_with_truncation'),
+    'streaming': ('approaches.approach6:StreamingProcessor', 'iterative_processing')
+}
+
+
+def _resolve(target):
+    """Import 'module:attribute' targets on demand; other factories are returned as is"""
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(':')
+        return getattr(importlib.import_module(module_name), attribute)
+    return target
+
+
+class ProcessorRegistry:
+    """Approach name -> (processor factory, method name), resolved only when first used"""
+
+    def __init__(self, approaches=None, discover_plugins=True):
+        self._specs = dict(BUILTIN_APPROACHES if approaches is None else approaches)
+        # Plugins are only looked up when a name is not registered or the full list is needed
+        self._plugins_loaded = not discover_plugins
+
+    def register(self, name, factory, method_name):
+        """Register an approach; `factory` is a callable or a 'module:attribute' string"""
+        self._specs[name] = (factory, method_name)
+
+    def _load_plugins(self):
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        from importlib.metadata import entry_points
+
+        try:
+            group = entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:  # Python < 3.10
+            group = entry_points().get(ENTRY_POINT_GROUP, [])
+        for entry_point in group:
+            if entry_point.name not in self._specs:
+                self._specs[entry_point.name] = (entry_point, None)
+
+    def __contains__(self, name):
+        if name not in self._specs:
+            self._load_plugins()
+        return name in self._specs
+
+    def names(self):
+        self._load_plugins()
+        return list(self._specs.keys())
+
+    def _spec(self, name):
+        if name not in self:
+            raise ValueError(f"Unknown approach: {name}. Available: {self.names()}")
+        factory, method_name = self._specs[name]
+        if hasattr(factory, 'load') and method_name is None:
+            # Entry points are loaded once and cached as ordinary factories
+            factory = factory.load()
+            method_name = getattr(factory, 'process_method', 'process')
+            self._specs[name] = (factory, method_name)
+        return factory, method_name
+
+    def create(self, name):
+        """Build a new processor instance for an approach"""
+        factory, _ = self._spec(name)
+        return _resolve(factory)()
+
+    def method_name(self, name):
+        return self._spec(name)[1]
+
+
+class LazyProcessors(dict):
+    """Processor dict that builds each processor the first time it is looked up"""
+
+    def __init__(self, registry):
+        super().__init__()
+        self.registry = registry
+
+    def __missing__(self, name):
+        processor = self.registry.create(name)
+        self[name] = processor
+        return processor
@@ -1,15 +1,51 @@
-from .helpers import (
-    format_result_output,
-    validate_data_input,
-    get_data_characteristics,
-    save_results_to_file,
-    load_sample_data
-)
-
-__all__ = [
-    'format_result_output',
-    'validate_data_input', 
-    'get_data_characteristics',
-    'save_results_to_file',
-    'load_sample_data'
-]
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first access (PEP 562); e.g. `span` should not
+# pull in shared memory or calibration support.
+_EXPORTS = {
+    'format_result_output': '.helpers',
+    'validate_data_input': '.helpers',
+    'get_data_characteristics': '.helpers',
+    'save_results_to_file': '.helpers',
+    'load_sample_data': '.helpers',
+    'DataProfile': '.helpers',
+    'rendered_length': '.helpers',
+    'ResultCache': '.cache',
+    'SharedPayload': '.transport',
+    'PayloadHandle': '.transport',
+    'read_payload': '.transport',
+    'generate_data': '.helpers',
+    'CostModel': '.cost_model',
+    'calibrate': '.cost_model',
+    'data_shape': '.cost_model',
+    'span': '.instrumentation',
+    'recording': '.instrumentation',
+    'Recorder': '.instrumentation',
+    'JsonlResultWriter': '.jsonl',
+    'read_jsonl': '.jsonl',
+    'load_results': '.jsonl',
+    'iter_leaves': '.json_stream',
+    'iter_json_leaves': '.json_stream',
+    'chunk_leaves': '.json_stream',
+    'format_path': '.json_stream',
+    'MinHashDeduplicator': '.dedup',
+    'resolve_duplicates': '.dedup',
+    'MemoryBudget': '.spill',
+    'SpilledList': '.spill',
+    'spilling': '.spill',
+    'spillable_list': '.spill'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
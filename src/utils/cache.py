@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .spill import json_default
+
+
+class ResultCache:
+    """Two-tier result cache: an in-memory LRU backed by an optional on-disk store.
+
+    Cached results are shared between callers and should be treated as read-only.
+    Results loaded from disk come back through JSON, so tuples become lists.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0}
+
+        self._disk_bytes = 0
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(os.path.getsize(path) for path in self._disk_files())
+
+    def make_key(self, content_hash: str, approach_name: str, processor: Any) -> str:
+        """Build a key from content hash, approach name and processor configuration"""
+        config = repr(sorted(vars(processor).items()))
+        return hashlib.sha256(f"{content_hash}|{approach_name}|{config}".encode()).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _disk_files(self):
+        return [os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir)
+                if name.endswith('.json')]
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for a key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+            if self.disk_dir is not None and os.path.exists(self._disk_path(key)):
+                try:
+                    with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                        result = json.load(f)
+                except (OSError, ValueError):
+                    result = None
+                if result is not None:
+                    self.stats["hits"] += 1
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, result)
+                    return result
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result: Any) -> None:
+        """Store a result in memory and, when configured, on disk"""
+        with self._lock:
+            self._remember(key, result)
+            if self.disk_dir is not None:
+                self._write_to_disk(key, result)
+
+    def _remember(self, key: str, result: Any) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _write_to_disk(self, key: str, result: Any) -> None:
+        encoded = json.dumps(result, default=json_default).encode('utf-8')
+        if len(encoded) > self.max_disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            self._disk_bytes -= os.path.getsize(path)
+        # Other caches (threads or processes) may share disk_dir, so each write gets its own temp file
+        temp_path = f"{path}.{os.getpid()}-{os.urandom(8).hex()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(encoded)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._disk_bytes += len(encoded)
+
+        if self._disk_bytes > self.max_disk_bytes:
+            # Evict the least recently written entries until under the limit
+            for old_path in sorted(self._disk_files(), key=os.path.getmtime):
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                if old_path == path:
+                    continue
+                self._disk_bytes -= os.path.getsize(old_path)
+                os.remove(old_path)
+
+    def clear(self) -> None:
+        """Drop every cached result from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self.disk_dir is not None:
+                for path in self._disk_files():
+                    os.remove(path)
+                self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current tier sizes"""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes
+            }
@@ -0,0 +1,113 @@
+import json
+import os
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .helpers import generate_data
+
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+DEFAULT_SHAPES = ("text", "numeric", "records", "nested")
+
+
+def data_shape(data: Any) -> str:
+    """Classify data into one of the calibration shapes"""
+    if isinstance(data, list):
+        if all(isinstance(x, (int, float)) for x in data[:100]):
+            return "numeric"
+        return "records"
+    if isinstance(data, dict):
+        return "nested"
+    return "text"
+
+
+def _fit_line(points: List[List[float]]) -> List[float]:
+    """Least-squares fit of y = intercept + slope * x, clamped to non-negative values"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance if variance else 0.0
+    slope = max(slope, 0.0)
+    intercept = max(mean_y - slope * mean_x, 0.0)
+    return [intercept, slope]
+
+
+class CostModel:
+    """Per-approach, per-shape linear runtime and peak-memory model fitted on this machine"""
+
+    def __init__(self, coefficients: Dict[str, Dict[str, Dict[str, List[float]]]],
+                 machine: Optional[Dict[str, Any]] = None):
+        # coefficients[approach][shape] = {"seconds": [a, b], "peak_bytes": [a, b]}
+        self.coefficients = coefficients
+        self.machine = machine or {}
+
+    def predict(self, approach_name: str, size: int, shape: str = "text") -> Dict[str, float]:
+        """Predicted runtime and peak memory for data of `size` characters"""
+        shapes = self.coefficients[approach_name]
+        model = shapes.get(shape) or shapes.get("text") or next(iter(shapes.values()))
+        seconds = model["seconds"][0] + model["seconds"][1] * size
+        peak_bytes = model["peak_bytes"][0] + model["peak_bytes"][1] * size
+        return {"seconds": seconds, "peak_bytes": peak_bytes}
+
+    def approaches(self) -> List[str]:
+        return list(self.coefficients.keys())
+
+    def save(self, path: str) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"machine": self.machine, "coefficients": self.coefficients}, f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "CostModel":
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        return cls(saved["coefficients"], saved.get("machine"))
+
+
+def calibrate(get_method: Callable[[str], Callable], approach_names: Iterable[str],
+              sizes: Iterable[int] = DEFAULT_SIZES, shapes: Iterable[str] = DEFAULT_SHAPES,
+              repeats: int = 3) -> CostModel:
+    """Micro-benchmark each approach over generated inputs and fit a CostModel.
+
+    Runtime is the best of `repeats` untraced runs; peak memory comes from a
+    separate run under tracemalloc so tracing does not distort the timings.
+    """
+    coefficients: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+    for approach_name in approach_names:
+        method = get_method(approach_name)
+        coefficients[approach_name] = {}
+        for shape in shapes:
+            time_points, memory_points = [], []
+            for size in sizes:
+                data = generate_data(shape, size)
+                actual_size = len(str(data))
+
+                best = float("inf")
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    method(data)
+                    best = min(best, time.perf_counter() - start)
+
+                tracemalloc.start()
+                try:
+                    method(data)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+
+                time_points.append([actual_size, best])
+                memory_points.append([actual_size, peak])
+
+            coefficients[approach_name][shape] = {
+                "seconds": _fit_line(time_points),
+                "peak_bytes": _fit_line(memory_points)
+            }
+
+    machine = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count()
+    }
+    return CostModel(coefficients, machine)
@@ -0,0 +1,124 @@
+import random
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Mersenne prime modulus of the universal hash family h(x) = (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+
+
+def _choose_bands(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """Pick (bands, rows) with the most rows whose candidate probability at `threshold` is >= `recall`"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class MinHashDeduplicator:
+    """Near-duplicate chunk detection with MinHash signatures indexed by banded LSH.
+
+    Chunks are compared by the Jaccard similarity of their word shingles,
+    estimated from `num_perm` MinHash values. LSH buckets limit comparisons to
+    likely candidates; a chunk whose estimated similarity to an earlier
+    representative is at least `threshold` is reported as its duplicate.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+        rng = random.Random(seed)
+        self._hash_family = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self.total_chunks = 0
+        self.duplicate_chunks = 0
+        self.duplicate_size = 0
+        self.total_size = 0
+
+    def shingles(self, chunk: Any) -> List[int]:
+        """crc32 hashes of the chunk's overlapping word n-grams"""
+        words = str(chunk).split()
+        if not words:
+            return []
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+        return [zlib.crc32(shingle.encode("utf-8", "surrogatepass")) for shingle in shingles]
+
+    def signature(self, chunk: Any) -> Tuple[int, ...]:
+        """MinHash signature: the minimum of each hash function over the chunk's shingles"""
+        shingles = self.shingles(chunk)
+        if not shingles:
+            return (_PRIME,) * self.num_perm
+        return tuple(min((a * x + b) % _PRIME for x in shingles) for a, b in self._hash_family)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+    def add(self, index: int, chunk: Any = None, signature: Optional[Tuple[int, ...]] = None) -> None:
+        """Index a chunk as a representative without checking it"""
+        if signature is None:
+            signature = self.signature(chunk)
+        self._signatures[index] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(index)
+
+    def check(self, index: int, chunk: Any) -> Optional[Dict[str, Any]]:
+        """Return {"duplicate_of", "similarity"} for a near-duplicate, else index the chunk and return None"""
+        signature = self.signature(chunk)
+        size = len(chunk) if isinstance(chunk, (str, list)) else len(str(chunk))
+        self.total_chunks += 1
+        self.total_size += size
+
+        best, best_similarity = None, 0.0
+        seen = set()
+        for key in self._band_keys(signature):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                similarity = self.similarity(signature, self._signatures[candidate])
+                if similarity > best_similarity:
+                    best, best_similarity = candidate, similarity
+
+        if best is not None and best_similarity >= self.threshold:
+            self.duplicate_chunks += 1
+            self.duplicate_size += size
+            return {"duplicate_of": best, "similarity": best_similarity}
+
+        self.add(index, signature=signature)
+        return None
+
+    def report(self) -> Dict[str, Any]:
+        """Savings so far: chunks (and their size) that did not need processing"""
+        return {
+            "threshold": self.threshold,
+            "total_chunks": self.total_chunks,
+            "unique_chunks": self.total_chunks - self.duplicate_chunks,
+            "duplicate_chunks": self.duplicate_chunks,
+            "skipped_size": self.duplicate_size,
+            "saved_fraction": self.duplicate_chunks / self.total_chunks if self.total_chunks else 0.0
+        }
+
+
+def resolve_duplicates(chunk_results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield full chunk results, filling each duplicate from its representative's result"""
+    representatives: Dict[int, Dict[str, Any]] = {}
+    for result in chunk_results:
+        if "duplicate_of" in result:
+            yield {**representatives[result["duplicate_of"]], **result}
+        else:
+            representatives[result["chunk_index"]] = result
+            yield result
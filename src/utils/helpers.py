@@ -1,5 +1,9 @@
+import hashlib
 import json
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .spill import json_default
 
 def format_result_output(result: Dict[str, Any], approach_name: str) -> str:
     """Format processing results for clean output display"""
@@ -39,11 +43,103 @@ def get_data_characteristics(data: Any) -> Dict[str, Any]:
         'complexity': 'high' if len(str(data)) > 10000 else 'medium' if len(str(data)) > 1000 else 'low'
     }
 
+# Types whose str() spells out every value, so equal strings mean equal data
+_EXACT_STR_TYPES = (str, bytes, int, float, bool, type(None))
+_EXACT_STR_CONTAINERS = (list, tuple, dict)
+
+
+def _has_exact_str(data: Any) -> bool:
+    """Whether str(data) identifies data; numpy/pandas objects elide values from theirs"""
+    pending = deque([data])
+    while pending:
+        value = pending.popleft()
+        if type(value) in _EXACT_STR_TYPES:
+            continue
+        if type(value) not in _EXACT_STR_CONTAINERS:
+            return False
+        pending.extend(value.items() if isinstance(value, dict) else value)
+    return True
+
+def rendered_length(data: Any) -> int:
+    """len(str(data)) for nested lists, tuples and dicts, without building the whole string"""
+    if isinstance(data, str):
+        return len(data)
+    total = 0
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if type(value) not in _EXACT_STR_CONTAINERS:
+            total += len(repr(value))
+            continue
+        # Brackets plus ", " between items; a 1-tuple renders as "(x,)"
+        total += 2 + 2 * max(len(value) - 1, 0) + (type(value) is tuple and len(value) == 1)
+        if isinstance(value, dict):
+            total += sum(len(repr(key)) + 2 for key in value)
+            pending.extend(value.values())
+        else:
+            pending.extend(value)
+    return total
+
+class DataProfile:
+    """Shared, computed-once views of a datum that every processor can reuse"""
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.text = str(data)
+        self.size = len(self.text)
+        self._tokens: Optional[List[str]] = None
+        self._paragraph_offsets: Optional[List[Tuple[int, int]]] = None
+        self._content_hash: Optional[str] = None
+        self._cacheable: Optional[bool] = None
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the type name and string form, computed on first use"""
+        if self._content_hash is None:
+            digest = hashlib.sha256(type(self.data).__name__.encode())
+            digest.update(self.text.encode('utf-8', 'surrogatepass'))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether content_hash identifies the data (only builtin scalars and containers qualify)"""
+        if self._cacheable is None:
+            self._cacheable = _has_exact_str(self.data)
+        return self._cacheable
+
+    @property
+    def tokens(self) -> List[str]:
+        """Whitespace tokens of the string form, split on first use"""
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+
+    @property
+    def token_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def paragraph_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of the blank-line separated paragraphs of the string form"""
+        if self._paragraph_offsets is None:
+            offsets = []
+            start = 0
+            while True:
+                end = self.text.find('\n\n', start)
+                if end == -1:
+                    offsets.append((start, self.size))
+                    break
+                offsets.append((start, end))
+                start = end + 2
+            self._paragraph_offsets = offsets
+        return self._paragraph_offsets
+
 def save_results_to_file(results: Dict[str, Any], filename: str = "processing_results.json") -> str:
     """Save processing results to a JSON file"""
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, default=str)
+            json.dump(results, f, indent=2, default=json_default)
         return f"Results saved to {filename}"
     except Exception as e:
         return f"Error saving results: {str(e)}"
@@ -64,4 +160,28 @@ def load_sample_data(data_type: str = "mixed") -> Any:
             "large_text": "Large content section. " * 100
         }
     else:
-        return "Default sample data"
\ No newline at end of file
+        return "Default sample data"
+
+def generate_data(shape: str = "text", size: int = 1000) -> Any:
+    """Generate data whose string form is roughly `size` characters, for benchmarking"""
+    if shape == "text":
+        paragraph = "Generated benchmark sentence with several ordinary words in it. " * 8 + "\n\n"
+        return (paragraph * (size // len(paragraph) + 1))[:size]
+    elif shape == "numeric":
+        # str() of each float plus separator is about 8 characters
+        return [round(i * 0.37, 2) for i in range(max(size // 8, 1))]
+    elif shape == "records":
+        # Each record renders to about 55 characters
+        return [{"id": i, "name": f"record_{i}", "value": i * 0.5} for i in range(max(size // 55, 1))]
+    elif shape == "nested":
+        # Sections of about 1000 characters each
+        return {
+            f"section_{i}": {
+                "title": f"Section {i}",
+                "items": [f"item_{i}_{j}" for j in range(40)],
+                "meta": {"index": i, "text": "Nested content. " * 20}
+            }
+            for i in range(max(size // 1000, 1))
+        }
+    else:
+        raise ValueError(f"Unknown data shape: {shape}. Available: ['text', 'numeric', 'records', 'nested']")
\ No newline at end of file
@@ -0,0 +1,120 @@
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# The recorder spans report to; None means instrumentation is off
+_active_recorder: ContextVar = ContextVar("active_recorder", default=None)
+
+
+class _NullSpan:
+    """Shared no-op span returned while no recorder is active"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, recorder: "Recorder", name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.recorder._enter(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder._exit(self)
+        return False
+
+
+class Recorder:
+    """Collects timing, allocation and (optionally) peak-memory records for spans"""
+
+    def __init__(self, trace_memory: bool = False, hooks: Optional[Iterable[Callable[[Dict[str, Any]], None]]] = None):
+        self.trace_memory = trace_memory
+        self.hooks = list(hooks or [])
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[_Span] = []
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def _enter(self, span: _Span) -> None:
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Keep the parent's peak before resetting the counter for the child
+                self._stack[-1].max_memory = max(self._stack[-1].max_memory, peak)
+            tracemalloc.reset_peak()
+            span.start_memory = current
+            span.max_memory = current
+        span.depth = len(self._stack)
+        self._stack.append(span)
+        span.start_blocks = sys.getallocatedblocks()
+        span.start_cpu = time.process_time()
+        span.start_wall = time.perf_counter()
+
+    def _exit(self, span: _Span) -> None:
+        wall = time.perf_counter() - span.start_wall
+        cpu = time.process_time() - span.start_cpu
+        record = {
+            "name": span.name,
+            "depth": span.depth,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "net_allocated_blocks": sys.getallocatedblocks() - span.start_blocks
+        }
+        self._stack.pop()
+        if self.trace_memory:
+            span.max_memory = max(span.max_memory, tracemalloc.get_traced_memory()[1])
+            record["peak_bytes"] = span.max_memory - span.start_memory
+            if self._stack:
+                self._stack[-1].max_memory = max(self._stack[-1].max_memory, span.max_memory)
+
+        self.records.append(record)
+        for hook in self.hooks:
+            hook(record)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Span records in completion order plus wall time totals per span name"""
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            totals[record["name"]] = totals.get(record["name"], 0.0) + record["wall_seconds"]
+        return {"spans": list(self.records), "wall_seconds_by_stage": totals}
+
+
+def span(name: str):
+    """Context manager timing a processing stage; a shared no-op when not recording"""
+    recorder = _active_recorder.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.span(name)
+
+
+@contextmanager
+def recording(trace_memory: bool = False, hooks: Optional[Iterable[Callable[[Dict[str, Any]], None]]] = None):
+    """Activate a Recorder for spans opened in this context.
+
+    With `trace_memory=True`, tracemalloc is started for the duration (if it
+    is not already running) and each span reports its peak memory.
+    """
+    recorder = Recorder(trace_memory, hooks)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _active_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active_recorder.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
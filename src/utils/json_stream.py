@@ -0,0 +1,287 @@
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_LITERALS = {"true": True, "false": False, "null": None}
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+_TEXT_PIECES = re.compile(r"\S+\s*|\s+")
+_END = object()
+
+
+def format_path(path: Path) -> str:
+    """Render a path tuple as a JSONPath string, e.g. $.nested_data.key2[1]"""
+    parts = ["$"]
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif _IDENTIFIER.match(key):
+            parts.append(f".{key}")
+        else:
+            parts.append(f"[{json.dumps(key)}]")
+    return "".join(parts)
+
+
+def _children(container: Any) -> Iterable[Tuple[Union[str, int], Any]]:
+    if isinstance(container, dict):
+        return ((str(key), value) for key, value in container.items())
+    return enumerate(container)
+
+
+def iter_leaves(data: Any) -> Iterator[Tuple[Path, Any]]:
+    """Yield (path, value) for every scalar (or empty container) of nested dicts and lists, in document order"""
+    if not isinstance(data, (dict, list, tuple)) or not data:
+        yield (), data
+        return
+
+    # Explicit stack of child iterators, so deep nesting cannot hit the recursion limit
+    stack = [((), iter(_children(data)))]
+    while stack:
+        prefix, children = stack[-1]
+        child = next(children, _END)
+        if child is _END:
+            stack.pop()
+            continue
+        key, value = child
+        path = prefix + (key,)
+        if isinstance(value, (dict, list, tuple)) and value:
+            stack.append((path, iter(_children(value))))
+        else:
+            yield path, value
+
+
+class _JsonReader:
+    """Buffered reader over a JSON text or binary stream, holding at most one token beyond the buffer"""
+
+    def __init__(self, source: Any, buffer_size: int):
+        self.source = source
+        self.buffer_size = buffer_size
+        self.decoder = None
+        self.buffer = ""
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+
+    def more(self, size: Optional[int] = None) -> bool:
+        """Append the next block to the unread part of the buffer; False at end of input"""
+        if self.eof:
+            return False
+        block = self.source.read(max(size or 0, self.buffer_size))
+        if isinstance(block, bytes):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder("utf-8")()
+            block = self.decoder.decode(block, final=not block)
+        if not block:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match:
+                self.pos = match.start()
+                return match.group()
+            self.pos = len(self.buffer)
+            if not self.more():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            self.error(f"Expected {char!r}")
+        self.pos += 1
+
+    def error(self, message: str) -> None:
+        raise ValueError(f"{message} at offset {self.consumed + self.pos}")
+
+    def scalar(self) -> Any:
+        """Read a string, number or literal starting at the next non-whitespace character"""
+        char = self.peek()
+        while True:
+            if char == '"':
+                try:
+                    value, end = scanstring(self.buffer, self.pos + 1)
+                except ValueError:
+                    # Unterminated (or invalid) string: it may just continue in the next block.
+                    # Reading as much again as is buffered keeps long strings linear to scan.
+                    if self.more(len(self.buffer) - self.pos):
+                        continue
+                    raise
+            else:
+                match = NUMBER_RE.match(self.buffer, self.pos)
+                if match:
+                    integer, fraction, exponent = match.groups()
+                    if fraction or exponent:
+                        value = float(integer + (fraction or "") + (exponent or ""))
+                    else:
+                        value = int(integer)
+                    end = match.end()
+                else:
+                    word = next((w for w in _LITERALS if self.buffer.startswith(w, self.pos)), None)
+                    if word is None:
+                        if len(self.buffer) - self.pos < 5 and self.more():
+                            continue
+                        self.error("Expected a JSON value")
+                    value, end = _LITERALS[word], self.pos + len(word)
+            # A number near the buffer edge may continue in the next block (e.g. "1." + "5")
+            if char != '"' and len(self.buffer) - end < 3 and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_leaves(source: Any, buffer_size: int = 65536) -> Iterator[Tuple[Path, Any]]:
+    """Parse a JSON file object (or a path) as a stream, yielding (path, value) like iter_leaves.
+
+    Only the current block and the path from the root to the current value
+    are held in memory, so arbitrarily large documents can be walked.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from iter_json_leaves(f, buffer_size)
+        return
+
+    reader = _JsonReader(source, buffer_size)
+    containers: List[str] = []
+    path: List[Union[str, int]] = []
+    expect_value = True
+
+    while True:
+        if expect_value:
+            char = reader.peek()
+            if char in ("{", "["):
+                reader.pos += 1
+                closing = "}" if char == "{" else "]"
+                if reader.peek() == closing:
+                    reader.pos += 1
+                    yield tuple(path), {} if char == "{" else []
+                    expect_value = False
+                    continue
+                if char == "{":
+                    key = _read_key(reader)
+                else:
+                    key = 0
+                containers.append(closing)
+                path.append(key)
+            else:
+                yield tuple(path), reader.scalar()
+                expect_value = False
+        elif not containers:
+            if reader.peek():
+                reader.error("Extra data")
+            return
+        else:
+            char = reader.peek()
+            if char == ",":
+                reader.pos += 1
+                if containers[-1] == "}":
+                    path[-1] = _read_key(reader)
+                else:
+                    path[-1] += 1
+                expect_value = True
+            elif char == containers[-1]:
+                reader.pos += 1
+                containers.pop()
+                path.pop()
+            else:
+                reader.error(f"Expected ',' or {containers[-1]!r}")
+
+
+def _read_key(reader: _JsonReader) -> str:
+    if reader.peek() != '"':
+        reader.error("Expected a string key")
+    key = reader.scalar()
+    reader.expect(":")
+    return key
+
+
+def _split_text(text: str, max_chars: int, max_tokens: Optional[int]) -> Iterator[str]:
+    """Split text at whitespace into parts within the budgets; parts concatenate back to the text"""
+    part, part_tokens, part_size = [], 0, 0
+    for match in _TEXT_PIECES.finditer(text):
+        piece = match.group()
+        # Words longer than a whole part are hard-split
+        for slice_start in range(0, len(piece), max_chars):
+            fragment = piece[slice_start:slice_start + max_chars]
+            tokens = 1 if fragment.strip() else 0
+            if part and (part_size + len(fragment) > max_chars or
+                         (max_tokens is not None and part_tokens + tokens > max_tokens)):
+                yield "".join(part)
+                part, part_tokens, part_size = [], 0, 0
+            part.append(fragment)
+            part_tokens += tokens
+            part_size += len(fragment)
+    if part:
+        yield "".join(part)
+
+
+def _common_prefix(a: Path, b: Path) -> Path:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return a[:length]
+
+
+def chunk_leaves(leaves: Iterable[Tuple[Path, Any]], max_size: int = 1000,
+                 max_tokens: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Group (path, value) leaves into chunks within a size (and optional token) budget.
+
+    Chunk boundaries always fall between values, never inside a key or value,
+    except that a string too large for one chunk is split into numbered parts.
+    Each chunk is {"path", "entries", "size", "tokens"}, where "path" is the
+    deepest path containing every entry and each entry is {"path", "value"}
+    (plus "part"/"parts" for split strings). Only one chunk is buffered.
+    """
+    entries: List[Dict[str, Any]] = []
+    prefix: Optional[Path] = None
+    size = tokens = 0
+
+    def flush():
+        return {"path": format_path(prefix), "entries": entries, "size": size, "tokens": tokens}
+
+    for path, value in leaves:
+        path_text = format_path(path)
+        rendered = json.dumps(value, ensure_ascii=False, default=str)
+        entry_size = len(path_text) + len(rendered)
+        entry_tokens = len(rendered.split())
+
+        over_budget = entry_size > max_size or (max_tokens is not None and entry_tokens > max_tokens)
+        if over_budget and isinstance(value, str):
+            if entries:
+                yield flush()
+                entries, prefix, size, tokens = [], None, 0, 0
+            # Leave room for the path and quotes in each part
+            parts = list(_split_text(value, max(max_size - len(path_text) - 2, 1), max_tokens))
+            for index, part in enumerate(parts):
+                part_rendered = json.dumps(part, ensure_ascii=False)
+                yield {
+                    "path": path_text,
+                    "entries": [{"path": path_text, "value": part, "part": index, "parts": len(parts)}],
+                    "size": len(path_text) + len(part_rendered),
+                    "tokens": len(part_rendered.split())
+                }
+            continue
+
+        if entries and (size + entry_size > max_size or
+                        (max_tokens is not None and tokens + entry_tokens > max_tokens)):
+            yield flush()
+            entries, prefix, size, tokens = [], None, 0, 0
+
+        entries.append({"path": path_text, "value": value})
+        prefix = path if prefix is None else _common_prefix(prefix, path)
+        size += entry_size
+        tokens += entry_tokens
+
+    if entries:
+        yield flush()
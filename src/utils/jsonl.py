@@ -0,0 +1,99 @@
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+from .spill import json_default
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class JsonlResultWriter:
+    """Append processing results to a JSON Lines file as they are produced.
+
+    Each top-level result is written as a "result" record; its chunk_results
+    are exploded into one "chunk_result" record each, so large results never
+    have to be serialized as a single document. Output is compact JSON and can
+    be gzip-compressed (the default for paths ending in .gz). With
+    `fsync_every=N` the file is flushed and fsynced every N records.
+    """
+
+    def __init__(self, path: str, compress: Optional[str] = None, fsync_every: int = 0, append: bool = False):
+        if compress is None and path.endswith(".gz"):
+            compress = "gzip"
+        if compress not in (None, "gzip"):
+            raise ValueError(f"Unknown compression: {compress}. Available: [None, 'gzip']")
+
+        self.path = path
+        self.fsync_every = fsync_every
+        self.records_written = 0
+        self._raw = open(path, 'ab' if append else 'wb')
+        self._file = gzip.GzipFile(fileobj=self._raw, mode='ab') if compress == "gzip" else self._raw
+
+    def write_record(self, record: Dict[str, Any]) -> None:
+        """Append one record as a compact JSON line"""
+        line = json.dumps(record, separators=(',', ':'), default=json_default)
+        self._file.write(line.encode('utf-8') + b"\n")
+        self.records_written += 1
+        if self.fsync_every and self.records_written % self.fsync_every == 0:
+            self.sync()
+
+    def write_result(self, name: str, result: Any) -> None:
+        """Write a result, streaming its chunk_results as separate records"""
+        if isinstance(result, dict) and "chunk_results" in result:
+            # The empty placeholder keeps the key on reload even when there are no chunk results
+            header = {key: [] if key == "chunk_results" else value for key, value in result.items()}
+            self.write_record({"type": "result", "name": name, "result": header})
+            for chunk_result in result["chunk_results"]:
+                self.write_chunk_result(name, chunk_result)
+        else:
+            self.write_record({"type": "result", "name": name, "result": result})
+
+    def write_chunk_result(self, name: str, chunk_result: Any) -> None:
+        """Write a single chunk result, e.g. as StreamingProcessor.stream_processing yields it"""
+        self.write_record({"type": "chunk_result", "name": name, "chunk": chunk_result})
+
+    def sync(self) -> None:
+        """Flush buffered records and fsync them to disk"""
+        self._file.flush()
+        if self._file is not self._raw:
+            self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def close(self) -> None:
+        if self._file is not self._raw:
+            self._file.close()
+        if self.fsync_every:
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+        self._raw.close()
+
+    def __enter__(self) -> "JsonlResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield records from a JSON Lines file, plain or gzip-compressed"""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == GZIP_MAGIC
+
+    opener = gzip.open if compressed else open
+    with opener(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Rebuild the {name: result} mapping from a JSON Lines file (loads everything into memory)"""
+    results: Dict[str, Any] = {}
+    for record in read_jsonl(path):
+        if record["type"] == "result":
+            results[record["name"]] = record["result"]
+        elif record["type"] == "chunk_result":
+            result = results.setdefault(record["name"], {})
+            result.setdefault("chunk_results", []).append(record["chunk"])
+    return results
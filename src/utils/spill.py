@@ -0,0 +1,206 @@
+import os
+import sys
+import threading
+import weakref
+from bisect import bisect_right
+from collections.abc import Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .instrumentation import span
+
+# The budget spillable lists account against; None means memory is unbounded
+_active_budget: ContextVar = ContextVar("active_memory_budget", default=None)
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """Approximate in-memory size of a result item (containers followed three levels deep)"""
+    size = sys.getsizeof(obj)
+    if _depth < 3:
+        if isinstance(obj, dict):
+            size += sum(estimate_size(key, _depth + 1) + estimate_size(value, _depth + 1)
+                        for key, value in obj.items())
+        elif isinstance(obj, (list, tuple)):
+            size += sum(estimate_size(item, _depth + 1) for item in obj)
+    return size
+
+
+class MemoryBudget:
+    """Bound on the bytes held by spillable intermediates, with a store to spill the excess to.
+
+    `store` is anything with save_to_storage(data, data_id) /
+    load_from_storage(data_id) / delete_from_storage(data_id), normally a
+    ReferenceBasedProcessor. Spilled segments go through JSON, so tuples
+    come back as lists. Counters are updated under a lock, so lists built
+    in different threads can share one budget.
+    """
+
+    def __init__(self, limit_bytes: int, store: Any, parent: Optional["MemoryBudget"] = None):
+        if limit_bytes <= 0:
+            raise ValueError(f"limit_bytes must be positive, got {limit_bytes}")
+        self.limit_bytes = limit_bytes
+        self.store = store
+        # Kept alive by every list of a per-call budget, e.g. for a store directory finalizer
+        self.parent = parent
+        self.in_memory_bytes = 0
+        self.peak_bytes = 0
+        self.spilled_bytes = 0
+        self.spilled_segments = 0
+        self._lock = threading.Lock()
+
+    def for_call(self) -> "MemoryBudget":
+        """Fresh accounting against the same limit and store, so calls neither add up nor crowd each other out"""
+        return MemoryBudget(self.limit_bytes, self.store, parent=self)
+
+    def _charge(self, size: int) -> bool:
+        """Account for bytes now held in memory; True when over the limit"""
+        with self._lock:
+            self.in_memory_bytes += size
+            self.peak_bytes = max(self.peak_bytes, self.in_memory_bytes)
+            return self.in_memory_bytes > self.limit_bytes
+
+    def _release(self, size: int, spilled: bool = False) -> None:
+        """Account for bytes leaving memory, either freed or written to the store"""
+        with self._lock:
+            self.in_memory_bytes -= size
+            if spilled:
+                self.spilled_bytes += size
+                self.spilled_segments += 1
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit_bytes": self.limit_bytes,
+                "in_memory_bytes": self.in_memory_bytes,
+                "peak_bytes": self.peak_bytes,
+                "spilled_bytes": self.spilled_bytes,
+                "spilled_segments": self.spilled_segments
+            }
+
+
+@contextmanager
+def spilling(budget: Optional[MemoryBudget]):
+    """Make spillable_list() account against `budget` in this context (None disables spilling)"""
+    token = _active_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _active_budget.reset(token)
+
+
+def spillable_list(items: Iterable[Any] = ()) -> Any:
+    """A plain list, or a SpilledList when a memory budget is active.
+
+    Processors build their result lists with this, so under spilling()
+    (e.g. DataProcessingManager(memory_budget=...)) results beyond the
+    budget move to its store, normally the reference store of
+    ReferenceBasedProcessor, and are read back on access. Without a
+    budget the caller gets an ordinary list.
+    """
+    budget = _active_budget.get()
+    if budget is None:
+        return list(items)
+    result = SpilledList(budget)
+    result.extend(items)
+    return result
+
+
+def _release(budget: MemoryBudget, state: Dict[str, Any]) -> None:
+    """Return a dead list's buffered bytes to the budget and delete its segments"""
+    budget._release(state["buffer_bytes"])
+    for data_id in state["segment_ids"]:
+        budget.store.delete_from_storage(data_id)
+
+
+class SpilledList(Sequence):
+    """Append-only list whose items move to the budget's store once the budget is exceeded.
+
+    Spilled segments are reloaded on access (one segment is kept loaded at a
+    time), so iteration and indexing work as for a list. Pickling produces a
+    plain list, and segments are deleted when the list is garbage collected.
+    """
+
+    def __init__(self, budget: MemoryBudget):
+        self._budget = budget
+        self._buffer: List[Any] = []
+        self._offsets: List[int] = []  # starting index of each spilled segment
+        self._spilled_length = 0
+        self._loaded: Tuple[Optional[int], List[Any]] = (None, [])
+        self._state = {"buffer_bytes": 0, "segment_ids": []}
+        weakref.finalize(self, _release, budget, self._state)
+
+    @property
+    def spilled_segments(self) -> int:
+        return len(self._offsets)
+
+    def append(self, item: Any) -> None:
+        size = estimate_size(item)
+        self._buffer.append(item)
+        self._state["buffer_bytes"] += size
+        if self._budget._charge(size):
+            self._spill()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.append(item)
+
+    def _spill(self) -> None:
+        """Move the in-memory items to a new segment in the store"""
+        data_id = f"spill-{os.getpid()}-{os.urandom(8).hex()}"
+        with span("spill.write"):
+            self._budget.store.save_to_storage(self._buffer, data_id)
+        self._state["segment_ids"].append(data_id)
+        self._offsets.append(self._spilled_length)
+        self._spilled_length += len(self._buffer)
+        self._budget._release(self._state["buffer_bytes"], spilled=True)
+        self._buffer = []
+        self._state["buffer_bytes"] = 0
+
+    def _segment(self, number: int) -> List[Any]:
+        if self._loaded[0] != number:
+            data_id = self._state["segment_ids"][number]
+            with span("spill.read"):
+                items = self._budget.store.load_from_storage(data_id)
+            if items is None:
+                raise FileNotFoundError(f"Spilled segment {data_id} is missing from the store")
+            self._loaded = (number, items)
+        return self._loaded[1]
+
+    def __len__(self) -> int:
+        return self._spilled_length + len(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SpilledList index out of range")
+        if index >= self._spilled_length:
+            return self._buffer[index - self._spilled_length]
+        number = bisect_right(self._offsets, index) - 1
+        return self._segment(number)[index - self._offsets[number]]
+
+    def __iter__(self) -> Iterator[Any]:
+        for number in range(len(self._offsets)):
+            yield from self._segment(number)
+        yield from self._buffer
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (list, SpilledList)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __repr__(self) -> str:
+        return f"SpilledList(length={len(self)}, spilled_segments={self.spilled_segments})"
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps default writing spilled lists as plain lists and anything else as str"""
+    if isinstance(obj, SpilledList):
+        return list(obj)
+    return str(obj)
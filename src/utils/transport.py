@@ -0,0 +1,122 @@
+import os
+import sys
+from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, NamedTuple, Optional, Union
+
+
+class PayloadHandle(NamedTuple):
+    """Picklable reference to a byte range of a shared payload"""
+    name: str
+    offset: int
+    length: int
+    is_text: bool
+
+
+# Segments created by this process, and the most recently attached segments by name
+_owned: Dict[str, shared_memory.SharedMemory] = {}
+_attached: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+# Attached mappings kept open for reuse; older ones are closed so unlinked segments can be freed
+_MAX_ATTACHED = 8
+
+# Whether this process's resource tracker is shared with the process that started it
+_tracker_state = {"pid": None, "inherited": False}
+
+
+def _tracker_inherited() -> bool:
+    """True when this process had a resource tracker before using shared memory itself.
+
+    multiprocessing children share their parent's tracker (fork copies it,
+    spawn and forkserver pass it on), which tracks segments as a set: a
+    child unregistering a parent's segment would drop the parent's entry.
+    Decided on first use in each process, before any segment is registered here.
+    """
+    if _tracker_state["pid"] != os.getpid():
+        _tracker_state["pid"] = os.getpid()
+        _tracker_state["inherited"] = getattr(resource_tracker._resource_tracker, "_fd", None) is not None
+    return _tracker_state["inherited"]
+
+
+class SharedPayload:
+    """A large str or bytes payload copied into shared memory once.
+
+    Worker processes receive small PayloadHandle tuples instead of the payload
+    itself and decode only the range they need. Use as a context manager, or
+    call close() once every worker is done, to release the segment.
+    """
+
+    def __init__(self, payload: Union[str, bytes]):
+        _tracker_inherited()
+        self.is_text = isinstance(payload, str)
+        data = payload.encode('utf-8') if self.is_text else payload
+        self.size = len(data)
+        self._text = payload if self.is_text else None
+        self._shm = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        self._shm.buf[:self.size] = data
+        self.name = self._shm.name
+        _owned[self.name] = self._shm
+
+    def handle(self, offset: int = 0, length: Optional[int] = None) -> PayloadHandle:
+        """Handle to a byte range of the payload (the whole payload by default)"""
+        if length is None:
+            length = self.size - offset
+        return PayloadHandle(self.name, offset, length, self.is_text)
+
+    def chunk_handles(self, chunk_size: int) -> Iterator[PayloadHandle]:
+        """Handles to consecutive chunks, matching ChunkingProcessor.chunk_text boundaries.
+
+        Text chunks are `chunk_size` characters, so byte ranges always fall on
+        UTF-8 character boundaries; bytes payloads are split every `chunk_size` bytes.
+        """
+        if not self.is_text or len(self._text) == self.size:
+            # Bytes, or ASCII text where characters and bytes line up
+            for offset in range(0, self.size, chunk_size):
+                yield self.handle(offset, min(chunk_size, self.size - offset))
+            return
+
+        offset = 0
+        for i in range(0, len(self._text), chunk_size):
+            length = len(self._text[i:i + chunk_size].encode('utf-8'))
+            yield self.handle(offset, length)
+            offset += length
+
+    def close(self) -> None:
+        """Release and unlink the shared memory segment"""
+        if _owned.pop(self.name, None) is not None:
+            self._shm.close()
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedPayload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a segment created by another process, reusing recent attachments"""
+    if name in _owned:
+        return _owned[name]
+    if name in _attached:
+        _attached.move_to_end(name)
+        return _attached[name]
+
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        inherited = _tracker_inherited()
+        shm = shared_memory.SharedMemory(name=name)
+        if not inherited:
+            # The creating process owns the segment; stop this process's own tracker from unlinking it
+            resource_tracker.unregister(shm._name, "shared_memory")
+    _attached[name] = shm
+    while len(_attached) > _MAX_ATTACHED:
+        _attached.popitem(last=False)[1].close()
+    return shm
+
+
+def read_payload(handle: PayloadHandle) -> Union[str, bytes]:
+    """Decode the range a handle points at straight from shared memory"""
+    shm = _attach(handle.name)
+    with shm.buf[handle.offset:handle.offset + handle.length] as view:
+        return str(view, 'utf-8') if handle.is_text else bytes(view)
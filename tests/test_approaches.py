@@ -1,8 +1,14 @@
 import unittest
 import sys
 import os
+import json
 import tempfile
 import shutil
+import io
+import itertools
+import functools
+import time
+import asyncio
 
 # Add src directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,13 +30,33 @@ ReferenceBasedProcessor = safe_import('approaches.approach3', 'ReferenceBasedPro
 HierarchicalProcessor = safe_import('approaches.approach4', 'HierarchicalProcessor')
 TokenAwareTruncationProcessor = safe_import('approaches.approach5', 'TokenAwareTruncationProcessor')
 StreamingProcessor = safe_import('approaches.approach6', 'StreamingProcessor')
+RollingContext = safe_import('approaches.approach6', 'RollingContext')
+AsyncStreamingProcessor = safe_import('approaches.approach6', 'AsyncStreamingProcessor')
 DataProcessingManager = safe_import('main', 'DataProcessingManager')
+Pipeline = safe_import('pipeline', 'Pipeline')
+Stage = safe_import('pipeline', 'Stage')
+ProcessorRegistry = safe_import('registry', 'ProcessorRegistry')
 
 # Import helper functions safely
 format_result_output = safe_import('utils.helpers', 'format_result_output')
 validate_data_input = safe_import('utils.helpers', 'validate_data_input')
 get_data_characteristics = safe_import('utils.helpers', 'get_data_characteristics')
 load_sample_data = safe_import('utils.helpers', 'load_sample_data')
+DataProfile = safe_import('utils.helpers', 'DataProfile')
+ResultCache = safe_import('utils.cache', 'ResultCache')
+SharedPayload = safe_import('utils.transport', 'SharedPayload')
+read_payload = safe_import('utils.transport', 'read_payload')
+CostModel = safe_import('utils.cost_model', 'CostModel')
+generate_data = safe_import('utils.helpers', 'generate_data')
+recording = safe_import('utils.instrumentation', 'recording')
+JsonlResultWriter = safe_import('utils.jsonl', 'JsonlResultWriter')
+read_jsonl = safe_import('utils.jsonl', 'read_jsonl')
+load_results = safe_import('utils.jsonl', 'load_results')
+resolve_duplicates = safe_import('utils.dedup', 'resolve_duplicates')
+MinHashDeduplicator = safe_import('utils.dedup', 'MinHashDeduplicator')
+MemoryBudget = safe_import('utils.spill', 'MemoryBudget')
+spilling = safe_import('utils.spill', 'spilling')
+spillable_list = safe_import('utils.spill', 'spillable_list')
 
 # Check if helpers are available
 HELPERS_AVAILABLE = all([
@@ -82,6 +108,65 @@ class TestChunkingProcessor(unittest.TestCase):
         self.assertIn("method", result)
         self.assertEqual(result["method"], "chunking")
 
+    def test_structure_chunks_keep_values_whole(self):
+        """Test dict chunks split between values, carry JSON paths and fit the budget"""
+        data = load_sample_data("mixed") if HELPERS_AVAILABLE else {"a": "b"}
+        chunks = list(self.processor.iter_structure_chunks(data, chunk_size=200))
+        self.assertGreater(len(chunks), 1)
+        entries = [entry for chunk in chunks for entry in chunk["entries"]]
+        self.assertIn({"path": "$.nested_data.key2[1]", "value": "b"}, entries)
+        self.assertTrue(all(chunk["size"] <= 200 for chunk in chunks))
+        # The oversized string is split into parts that reassemble exactly
+        parts = [entry for entry in entries if entry["path"] == "$.large_text"]
+        self.assertGreater(len(parts), 1)
+        self.assertEqual("".join(entry["value"] for entry in parts), data["large_text"])
+        result = self.processor.process_large_data_in_chunks(data)
+        self.assertEqual(result["chunk_results"][0]["chunk_type"], "structure")
+
+    def test_original_size_without_rendering_dict(self):
+        """Test a dict's original_size matches its str() length without rendering it whole"""
+        import tracemalloc
+
+        data = {f"key{i}": "v" * 200 for i in range(10000)}
+        rendered_size = len(str(data))
+        tracemalloc.start()
+        try:
+            result = ChunkingProcessor().process_large_data_in_chunks(data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(result["original_size"], rendered_size)
+        self.assertLess(peak, rendered_size)
+
+    def test_dedup_repeated_text(self):
+        """Test near-duplicate chunks are skipped and map back to their representative"""
+        data = "This is a very long text piece that will be repeated many times. " * 400
+        processor = ChunkingProcessor(chunk_size=1000)
+        plain = processor.process_large_data_in_chunks(data)
+        deduped = processor.process_large_data_in_chunks(data, dedup=True)
+
+        self.assertEqual(deduped["dedup"]["unique_chunks"], 1)
+        self.assertEqual(deduped["dedup"]["duplicate_chunks"], plain["total_chunks"] - 1)
+        self.assertEqual(deduped["chunk_results"][5]["duplicate_of"], 0)
+        resolved = [{key: value for key, value in result.items() if key not in ("duplicate_of", "similarity")}
+                    for result in resolve_duplicates(deduped["chunk_results"])]
+        self.assertEqual(resolved, plain["chunk_results"])
+
+        distinct = " ".join(f"word{i}" for i in range(3000))
+        self.assertEqual(processor.process_large_data_in_chunks(distinct, dedup=True)["dedup"]["duplicate_chunks"], 0)
+    
+    def test_json_file_chunks_match_in_memory(self):
+        """Test a JSON file parsed as a stream chunks like the loaded document"""
+        data = {"users": [{"id": i, "name": f"user {i}", "score": i / 4, "active": i % 2 == 0} for i in range(50)],
+                "meta": {"empty": {}, "note": None, "unicode key": "é"}}
+        text = json.dumps(data, indent=2)
+        expected = list(self.processor.iter_structure_chunks(data, chunk_size=300, max_tokens=40))
+        streamed = list(self.processor.iter_json_file_chunks(io.BytesIO(text.encode('utf-8')), chunk_size=300,
+                                                             max_tokens=40, buffer_size=7))
+        self.assertEqual(streamed, expected)
+        self.assertTrue(all(chunk["tokens"] <= 40 for chunk in streamed))
+        self.assertEqual(expected[-1]["entries"][-1]["path"], '$.meta["unicode key"]')
+
 class TestSummarizationProcessor(unittest.TestCase):
     """Test cases for SummarizationProcessor"""
     
@@ -123,6 +208,18 @@ class TestReferenceBasedProcessor(unittest.TestCase):
         
         self.assertIsInstance(result, dict)
         self.assertIn("method", result)
+    
+    def test_concurrent_saves_of_same_id(self):
+        """Test threads saving the same data_id never collide on a temp file"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        data = {"field": "same data " * 100}
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ids = list(pool.map(lambda _: self.processor.save_to_storage(data, "shared"), range(200)))
+        
+        self.assertEqual(set(ids), {"shared"})
+        self.assertEqual(os.listdir(self.temp_dir), ["shared.json"])
+        self.assertEqual(self.processor.load_from_storage("shared"), data)
 
 class TestHierarchicalProcessor(unittest.TestCase):
     """Test cases for HierarchicalProcessor"""
@@ -141,6 +238,13 @@ class TestHierarchicalProcessor(unittest.TestCase):
         self.assertIn("method", result)
         self.assertEqual(result["method"], "hierarchical")
 
+if TokenAwareTruncationProcessor is not None:
+    class MarkedTruncationProcessor(TokenAwareTruncationProcessor):
+        """Subclass override that worker processes must honour (module level so it pickles)"""
+
+        def truncate_tokens(self, tokens, max_tokens=None):
+            return "[marked] " + super().truncate_tokens(tokens, max_tokens)
+
 class TestTokenAwareTruncationProcessor(unittest.TestCase):
     """Test cases for TokenAwareTruncationProcessor"""
     
@@ -157,6 +261,27 @@ class TestTokenAwareTruncationProcessor(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertIn("method", result)
 
+    def test_process_many_with_truncation(self):
+        """Test batch truncation keeps input order and aggregates token counts"""
+        documents = ["short text", " ".join([f"token{i}" for i in range(100)]), "another short one"]
+        result = self.processor.process_many_with_truncation(documents)
+
+        self.assertEqual(result["total_documents"], 3)
+        self.assertEqual(result["truncated_documents"], 1)
+        self.assertEqual(result["results"][1], self.processor.process_with_truncation(documents[1]))
+        self.assertEqual(result["results"][2]["data"], "another short one")
+        self.assertEqual(result["original_tokens"], 2 + 100 + 3)
+
+    def test_process_pool_matches_serial(self):
+        """Test the workers > 1 pool path returns the serial results, honouring subclass overrides"""
+        processor = MarkedTruncationProcessor(max_tokens=15)
+        documents = [" ".join(f"word{i}" for i in range(n)) for n in range(0, 60, 3)]
+        serial = processor.process_many_with_truncation(documents)
+        pooled = processor.process_many_with_truncation(documents, workers=2, batch_size=4)
+
+        self.assertEqual(pooled, serial)
+        self.assertTrue(pooled["results"][-1]["truncated_data"].startswith("[marked]"))
+
 class TestStreamingProcessor(unittest.TestCase):
     """Test cases for StreamingProcessor"""
     
@@ -174,6 +299,189 @@ class TestStreamingProcessor(unittest.TestCase):
         self.assertIn("method", result)
         self.assertEqual(result["method"], "streaming_iterative")
 
+    def test_rolling_context_is_bounded(self):
+        """Test the rolling context evicts old words and renders lazily"""
+        context = RollingContext(context_limit=50)
+        for i in range(100):
+            context.append(f"result number {i}")
+
+        rendered = str(context)
+        self.assertEqual(len(context), len(rendered))
+        self.assertEqual(len(rendered.split()), 10)
+        self.assertTrue(rendered.endswith("number 99"))
+
+    def test_rolling_context_matches_update_context(self):
+        """Test the rolling window renders and measures exactly like update_context"""
+        processor = StreamingProcessor(context_limit=50)
+        context, rendered = RollingContext(50), ""
+        for i in range(40):
+            result = {"chunk_data": "a  b\n c" * (i % 4), "chunk_index": i}
+            context.append(result)
+            rendered = processor.update_context(rendered, result)
+            self.assertEqual((str(context), len(context)), (rendered, len(rendered)))
+
+    def test_process_with_context_receives_str(self):
+        """Test overrides of process_with_context still get the context as a string"""
+        seen = []
+
+        class RecordingProcessor(StreamingProcessor):
+            def process_with_context(self, data_chunk, context):
+                seen.append(context)
+                return super().process_with_context(data_chunk, context)
+
+        RecordingProcessor(context_limit=100).iterative_processing(["a", "b", "c"], chunk_size=1)
+        self.assertTrue(all(isinstance(context, str) for context in seen))
+        self.assertEqual(seen[0], "")
+        self.assertIn("chunk_data", seen[1])
+
+    def test_builtin_process_with_context_gets_rolling_context(self):
+        """Test the built-in method is handed the window itself rather than a rendered copy"""
+        self.assertIsInstance(self.processor.context_argument(RollingContext(100)), RollingContext)
+
+    def test_stream_processing_endless_iterator(self):
+        """Test the generator API yields results from an endless iterator"""
+        results = self.processor.stream_processing(itertools.count(), chunk_size=5)
+
+        first, second = next(results), next(results)
+        self.assertEqual(first["chunk_data"], "[0, 1, 2, 3, 4]")
+        self.assertEqual(second["chunk_index"], 1)
+        self.assertTrue(second["has_context"])
+
+    def test_iterative_processing_file_object(self):
+        """Test streaming from a file object matches streaming the same string"""
+        text = "streamed text " * 40
+        from_file = self.processor.iterative_processing(io.StringIO(text))
+        from_string = self.processor.iterative_processing(text)
+
+        self.assertEqual(from_file, from_string)
+
+    def test_resume_after_crash(self):
+        """Test a crashed checkpointed run resumes from its last checkpoint"""
+        if ReferenceBasedProcessor is None:
+            self.skipTest("ReferenceBasedProcessor not available - create approaches/approach3.py")
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        store = ReferenceBasedProcessor(storage_dir=temp_dir)
+        data = ["item" + str(i) for i in range(10)]
+
+        class CrashingProcessor(StreamingProcessor):
+            def process_with_context(self, data_chunk, context):
+                if data_chunk == ["item7"]:
+                    raise RuntimeError("worker died")
+                return super().process_with_context(data_chunk, context)
+
+        with self.assertRaises(RuntimeError):
+            CrashingProcessor(context_limit=100).iterative_processing(
+                data, chunk_size=1, checkpoint_store=store, checkpoint_interval=3)
+
+        resumed = self.processor.resume_processing(data, store, checkpoint_interval=3, chunk_size=1)
+        uninterrupted = self.processor.iterative_processing(data, chunk_size=1)
+
+        self.assertEqual(resumed["resumed_from_chunk"], 6)
+        self.assertEqual(resumed["chunk_results"], uninterrupted["chunk_results"])
+        self.assertEqual(resumed["final_context_length"], uninterrupted["final_context_length"])
+
+    def test_checkpoint_tied_to_its_input(self):
+        """Test default checkpoint IDs separate inputs and resuming with other input is rejected"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        store = ReferenceBasedProcessor(storage_dir=temp_dir)
+        first = ["first" + str(i) for i in range(6)]
+        second = ["second" + str(i) for i in range(6)]
+
+        self.processor.iterative_processing(first, chunk_size=1, checkpoint_store=store, checkpoint_interval=2)
+        self.processor.iterative_processing(second, chunk_size=1, checkpoint_store=store, checkpoint_interval=2)
+        resumed = self.processor.resume_processing(first, store, chunk_size=1)
+        self.assertEqual(resumed["chunk_results"][0]["chunk_data"], "['first0']")
+
+        checkpoint_id = self.processor.default_checkpoint_id(first)
+        with self.assertRaises(ValueError):
+            self.processor.resume_processing(second, store, checkpoint_id=checkpoint_id, chunk_size=1)
+        with self.assertRaises(ValueError):
+            self.processor.resume_processing(first + ["extra"], store, checkpoint_id=checkpoint_id, chunk_size=1)
+        with self.assertRaises(ValueError):
+            self.processor.resume_processing(iter(first), store, chunk_size=1)
+
+    def test_dedup_with_checkpoint_resume(self):
+        """Test duplicates are skipped, leave the context alone and survive a resume"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        store = ReferenceBasedProcessor(storage_dir=temp_dir)
+        data = ["the same repeated words in every copy"] * 4 + [f"unique item {i}" for i in range(4)] * 2
+
+        result = self.processor.iterative_processing(data, chunk_size=1, dedup=True)
+        self.assertEqual(result["dedup"]["duplicate_chunks"], 7)
+        self.assertEqual(result["chunk_results"][3], {"chunk_index": 3, "duplicate_of": 0, "similarity": 1.0})
+        self.assertEqual(result["chunk_results"][9]["duplicate_of"], 5)
+
+        class CrashingProcessor(StreamingProcessor):
+            def process_with_context(self, data_chunk, context):
+                if data_chunk == ["unique item 3"]:
+                    raise RuntimeError("worker died")
+                return super().process_with_context(data_chunk, context)
+
+        with self.assertRaises(RuntimeError):
+            CrashingProcessor(context_limit=100).iterative_processing(
+                data, chunk_size=1, checkpoint_store=store, checkpoint_interval=2, dedup=True)
+        resumed = self.processor.resume_processing(data, store, checkpoint_interval=2, chunk_size=1,
+                                                   deduplicator=MinHashDeduplicator())
+        self.assertEqual(resumed["chunk_results"], result["chunk_results"])
+
+class TestAsyncStreamingProcessor(unittest.TestCase):
+    """Test cases for AsyncStreamingProcessor"""
+
+    def setUp(self):
+        if AsyncStreamingProcessor is None:
+            self.skipTest("AsyncStreamingProcessor not available - check approaches/approach6.py")
+
+    def test_results_in_order_with_bounded_concurrency(self):
+        """Test slow chunks finishing out of order are still emitted in order"""
+        state = {"active": 0, "peak": 0}
+
+        async def handler(chunk):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            # Earlier chunks take longer, so they complete last
+            await asyncio.sleep(0.01 * (10 - chunk[0]))
+            state["active"] -= 1
+            return chunk
+
+        processor = AsyncStreamingProcessor(context_limit=100, concurrency=3, chunk_handler=handler)
+        result = asyncio.run(processor.aiterative_processing(list(range(10)), chunk_size=1))
+        expected = list(StreamingProcessor(context_limit=100).stream_processing(list(range(10)), chunk_size=1))
+
+        self.assertEqual([r["chunk_data"] for r in result["chunk_results"]], [f"[{i}]" for i in range(10)])
+        self.assertEqual(result["chunk_results"], expected)
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_failure_cancels_and_retrieves_pending_chunks(self):
+        """Test a failing head chunk leaves no running or unretrieved tasks behind"""
+        import gc
+
+        async def handler(chunk):
+            if chunk[0] == 0:
+                await asyncio.sleep(0.01)
+            elif chunk[0] == 2:
+                await asyncio.sleep(10)
+            raise RuntimeError(f"chunk {chunk[0]} failed")
+
+        async def run():
+            errors = []
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            processor = AsyncStreamingProcessor(context_limit=100, concurrency=4, chunk_handler=handler)
+            with self.assertRaises(RuntimeError):
+                await processor.aiterative_processing(list(range(8)), chunk_size=1)
+            remaining = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            gc.collect()
+            await asyncio.sleep(0)
+            return remaining, errors
+
+        start = time.perf_counter()
+        remaining, errors = asyncio.run(run())
+        self.assertEqual(remaining, [])
+        self.assertEqual(errors, [])
+        self.assertLess(time.perf_counter() - start, 5)
+
 class TestHelpers(unittest.TestCase):
     """Test cases for helper functions"""
     
@@ -215,6 +523,15 @@ class TestHelpers(unittest.TestCase):
         self.assertIn("TEST APPROACH", output)
         self.assertIn("test_method", output)
     
+    def test_generate_data_shapes(self):
+        """Test generated benchmark data is close to the requested size"""
+        if generate_data is None:
+            self.skipTest("generate_data not available - check utils/helpers.py")
+        for shape in ("text", "numeric", "records", "nested"):
+            size = len(str(generate_data(shape, 20000)))
+            self.assertGreater(size, 15000)
+            self.assertLess(size, 25000)
+
     def test_load_sample_data(self):
         """Test sample data loading"""
         small_data = load_sample_data("small")
@@ -226,6 +543,206 @@ class TestHelpers(unittest.TestCase):
         mixed_data = load_sample_data("mixed")
         self.assertIsNotNone(mixed_data)
 
+class TestResultCache(unittest.TestCase):
+    """Test cases for ResultCache"""
+
+    def setUp(self):
+        if ResultCache is None or DataProcessingManager is None:
+            self.skipTest("ResultCache not available - check utils/cache.py")
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+
+    def test_repeat_request_hits_cache(self):
+        """Test an identical payload is served from the cache"""
+        manager = DataProcessingManager(cache=ResultCache())
+        data = "cached payload " * 100
+
+        first = manager.process_with_approach(data, "chunking")
+        second = manager.process_with_approach(data, "chunking")
+
+        self.assertIs(first, second)
+        self.assertEqual(manager.cache.get_stats()["hits"], 1)
+        self.assertEqual(manager.cache.get_stats()["misses"], 1)
+
+    def test_processor_config_is_part_of_key(self):
+        """Test changing a processor's configuration misses the cache"""
+        manager = DataProcessingManager(cache=ResultCache())
+        data = "cached payload " * 100
+        manager.process_with_approach(data, "chunking")
+        manager.processors["chunking"].chunk_size = 10
+
+        result = manager.process_with_approach(data, "chunking")
+
+        self.assertEqual(result["total_chunks"], 150)
+        self.assertEqual(manager.cache.get_stats()["misses"], 2)
+
+    def test_lossy_str_payload_bypasses_cache(self):
+        """Test payloads whose string form elides values are not served from the cache"""
+        class Elided(list):
+            def __str__(self):
+                return "[" + ", ".join(map(str, self[:3])) + ", ...]"
+
+        manager = DataProcessingManager(cache=ResultCache())
+        manager.process_with_approach(Elided(range(100)), "chunking")
+        manager.process_with_approach(Elided(range(1, 101)), "chunking")
+
+        self.assertEqual(manager.cache.get_stats()["hits"] + manager.cache.get_stats()["misses"], 0)
+
+    def test_reference_approach_writes_storage_on_repeat(self):
+        """Test the reference approach is not cached, so its data is stored on every call"""
+        manager = DataProcessingManager(cache=ResultCache())
+        manager.processors["reference"] = ReferenceBasedProcessor(storage_dir=self.temp_dir)
+        data = "stored payload " * 100
+
+        manager.process_with_approach(data, "reference")
+        shutil.rmtree(self.temp_dir)
+        manager.process_with_all_approaches(data)
+
+        self.assertEqual(len(os.listdir(self.temp_dir)), 1)
+
+    def test_lru_eviction_and_disk_tier(self):
+        """Test evicted entries are still served from the disk tier"""
+        cache = ResultCache(max_entries=1, disk_dir=self.temp_dir)
+        cache.put("a", {"value": 1})
+        cache.put("b", {"value": 2})
+
+        self.assertEqual(cache.get_stats()["memory_entries"], 1)
+        self.assertEqual(cache.get("a"), {"value": 1})
+        self.assertEqual(cache.get_stats()["disk_hits"], 1)
+        self.assertEqual(ResultCache(disk_dir=self.temp_dir).get("b"), {"value": 2})
+
+    def test_caches_sharing_disk_dir(self):
+        """Test several caches writing the same key to one disk directory concurrently"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        caches = [ResultCache(disk_dir=self.temp_dir) for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: caches[i % 8].put("shared", {"value": 1}), range(200)))
+
+        self.assertEqual(os.listdir(self.temp_dir), ["shared.json"])
+        self.assertEqual(ResultCache(disk_dir=self.temp_dir).get("shared"), {"value": 1})
+
+    def test_disk_size_limit(self):
+        """Test the disk tier evicts old entries past its byte limit"""
+        cache = ResultCache(max_entries=1, disk_dir=self.temp_dir, max_disk_bytes=100)
+        for i in range(10):
+            cache.put(f"key{i}", {"value": "x" * 30})
+
+        self.assertLessEqual(cache.get_stats()["disk_bytes"], 100)
+        self.assertIsNone(cache.get("key0"))
+
+def read_in_worker(handles):
+    """Read handles in a worker process and report its open attachments (module level so it pickles)"""
+    import utils.transport as transport
+    return [read_payload(handle) for handle in handles], len(transport._attached)
+
+class TestSharedPayload(unittest.TestCase):
+    """Test cases for the shared-memory transport"""
+
+    def setUp(self):
+        if SharedPayload is None or ChunkingProcessor is None:
+            self.skipTest("SharedPayload not available - check utils/transport.py")
+
+    def test_chunk_handles_match_chunk_text(self):
+        """Test chunk handles decode to the same chunks as ChunkingProcessor"""
+        text = "naïve café text " * 50
+        with SharedPayload(text) as payload:
+            chunks = [read_payload(handle) for handle in payload.chunk_handles(30)]
+
+        self.assertEqual(chunks, ChunkingProcessor().chunk_text(text, 30))
+
+    def test_bytes_payload(self):
+        """Test bytes payloads round-trip through handles"""
+        with SharedPayload(b"0123456789") as payload:
+            self.assertEqual(read_payload(payload.handle(2, 3)), b"234")
+
+    def test_worker_attachments_are_bounded(self):
+        """Test a spawned worker shares the parent's tracker and keeps few segments attached"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        payloads = [SharedPayload(f"payload {i}") for i in range(12)]
+        try:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                texts, attached = pool.submit(read_in_worker, [p.handle() for p in payloads]).result()
+            self.assertEqual(texts, [f"payload {i}" for i in range(12)])
+            self.assertLessEqual(attached, 8)
+            # The worker's exit must not have unlinked the parent's segments
+            self.assertEqual([read_payload(p.handle()) for p in payloads], texts)
+        finally:
+            for payload in payloads:
+                payload.close()
+
+    def test_process_many_sends_large_documents_by_handle(self):
+        """Test large documents processed through shared memory match direct processing"""
+        if DataProcessingManager is None:
+            self.skipTest("DataProcessingManager not available - check main.py")
+        manager = DataProcessingManager()
+        documents = ["large document " * 200, "small"]
+        result = manager.process_many(documents, "truncation", workers=2, shared_memory_threshold=100)
+
+        self.assertEqual(result["results"], [manager.process_with_approach(doc, "truncation") for doc in documents])
+
+class TestJsonlResultWriter(unittest.TestCase):
+    """Test cases for the streaming JSON Lines result writer"""
+
+    def setUp(self):
+        if JsonlResultWriter is None or ChunkingProcessor is None:
+            self.skipTest("JsonlResultWriter not available - check utils/jsonl.py")
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+
+    def test_round_trip_plain_and_gzip(self):
+        """Test chunk results are written as separate records and read back lazily"""
+        result = ChunkingProcessor(chunk_size=10).process_large_data_in_chunks("abcdefghij" * 5)
+        for filename in ("results.jsonl", "results.jsonl.gz"):
+            path = os.path.join(self.temp_dir, filename)
+            with JsonlResultWriter(path, fsync_every=2) as writer:
+                writer.write_result("chunked", result)
+                writer.write_result("small", {"method": "no_processing"})
+
+            records = read_jsonl(path)
+            self.assertEqual(next(records)["type"], "result")
+            self.assertEqual(sum(1 for record in records if record["type"] == "chunk_result"), 5)
+            self.assertEqual(load_results(path), {"chunked": result, "small": {"method": "no_processing"}})
+
+    def test_empty_chunk_results_round_trip(self):
+        """Test a result with no chunk results reloads with an empty chunk_results list"""
+        path = os.path.join(self.temp_dir, "results.jsonl")
+        result = ChunkingProcessor().process_large_data_in_chunks("")
+        with JsonlResultWriter(path) as writer:
+            writer.write_result("empty", result)
+
+        self.assertEqual(load_results(path), {"empty": result})
+
+    def test_records_are_compact(self):
+        """Test records are single compact lines"""
+        path = os.path.join(self.temp_dir, "results.jsonl")
+        with JsonlResultWriter(path) as writer:
+            writer.write_chunk_result("stream", {"chunk_index": 0, "has_context": False})
+
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"type":"chunk_result","name":"stream","chunk":{"chunk_index":0,"has_context":false}}\n')
+
+class SteadyProcessor:
+    """Approach that takes a fixed time (module level so it pickles)"""
+
+    def __init__(self, method):
+        self.method = method
+
+    def process(self, data, profile=None):
+        time.sleep(0.2)
+        return {"method": self.method}
+
+class SlowHeadSummarizer:
+    """Summarizer whose "slow" document holds up ordered output (module level so it pickles)"""
+
+    def process_with_summarization(self, data, profile=None):
+        if data == "slow":
+            time.sleep(0.5)
+        return {"method": "summarization"}
+
 class TestDataProcessingManager(unittest.TestCase):
     """Test cases for DataProcessingManager"""
     
@@ -257,6 +774,318 @@ class TestDataProcessingManager(unittest.TestCase):
         else:
             self.skipTest("recommend_approach method not implemented")
 
+    def test_process_with_each_approach(self):
+        """Test every approach dispatches to its own processor method"""
+        data = "hierarchical test data " * 20
+        self.assertEqual(self.manager.process_with_approach(data, "summarization")["method"], "direct_processing")
+        self.assertEqual(self.manager.process_with_approach(data, "hierarchical")["method"], "hierarchical")
+        self.assertEqual(self.manager.process_with_approach(data, "streaming")["method"], "streaming_iterative")
+
+    def test_shared_profile_matches_unprofiled_results(self):
+        """Test every approach gives the same result with a shared profile"""
+        if DataProfile is None:
+            self.skipTest("DataProfile not available - check utils/helpers.py")
+        samples = ["para one " * 40 + "\n\n" + "short\n\n" + "para three " * 30, {"key": "value " * 300}]
+        for data in samples:
+            profile = DataProfile(data)
+            for approach in ("chunking", "summarization", "hierarchical", "truncation", "streaming"):
+                self.assertEqual(self.manager.process_with_approach(data, approach, profile=profile),
+                                 self.manager.process_with_approach(data, approach))
+
+    def test_recommend_approach_within_budget(self):
+        """Test a cost model steers recommendations to approaches within budget"""
+        if CostModel is None:
+            self.skipTest("CostModel not available - check utils/cost_model.py")
+        linear = lambda per_char: {"text": {"seconds": [0.0, per_char], "peak_bytes": [0.0, 2.0]}}
+        self.manager.cost_model = CostModel({
+            "chunking": linear(1e-8), "summarization": linear(1e-6), "streaming": linear(1e-5)
+        })
+        data = "x" * 20000
+
+        self.assertEqual(self.manager.recommend_approach(data), "streaming")
+        self.assertEqual(self.manager.recommend_approach(data, latency_budget=1.0), "streaming")
+        prediction = self.manager.recommend_with_prediction(data, latency_budget=0.05)
+        self.assertEqual(prediction["approach"], "chunking")
+        self.assertTrue(prediction["fits_budget"])
+        self.assertAlmostEqual(prediction["predicted_seconds"], 20000 * 1e-8)
+
+    def test_calibrate_cost_model(self):
+        """Test calibration fits a model for every approach and saves it"""
+        if CostModel is None:
+            self.skipTest("CostModel not available - check utils/cost_model.py")
+        path = os.path.join(tempfile.mkdtemp(), "cost_model.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path), True)
+        self.manager.calibrate_cost_model(sizes=[1000, 4000], shapes=["text", "records"], repeats=1, path=path)
+
+        model = CostModel.load(path)
+        self.assertEqual(sorted(model.approaches()), sorted(self.manager.get_available_approaches()))
+        self.assertGreaterEqual(model.predict("chunking", 10000, "records")["seconds"], 0)
+
+    def test_instrumented_processing(self):
+        """Test instrumentation records per-stage spans and reports them to hooks"""
+        if recording is None:
+            self.skipTest("Instrumentation not available - check utils/instrumentation.py")
+        seen = []
+        manager = DataProcessingManager(cache=ResultCache(), instrumentation_hooks=[seen.append])
+        data = {"key": "value " * 300}
+
+        result = manager.process_with_approach(data, "chunking", instrument=True, trace_memory=True)
+        stages = {record["name"] for record in result["instrumentation"]["spans"]}
+
+        self.assertTrue({"chunking.total", "chunking.render", "chunking.split", "chunking.process_chunks"} <= stages)
+        self.assertTrue(all("peak_bytes" in record and "cpu_seconds" in record for record in seen))
+        self.assertEqual(len(seen), len(result["instrumentation"]["spans"]))
+        self.assertNotIn("instrumentation", manager.process_with_approach(data, "chunking"))
+
+    def test_render_span_is_not_nested_in_split(self):
+        """Test rendering a non-text datum is timed beside chunking.split, not inside it"""
+        if recording is None:
+            self.skipTest("Instrumentation not available - check utils/instrumentation.py")
+        result = self.manager.process_with_approach(set(range(500)), "chunking", instrument=True)
+        spans = result["instrumentation"]["spans"]
+        split_depth = next(record["depth"] for record in spans if record["name"] == "chunking.split")
+
+        self.assertEqual({record["depth"] for record in spans if record["name"] == "chunking.render"}, {split_depth})
+
+    def test_memory_budget_spills_results(self):
+        """Test results over the memory budget spill to storage and reload transparently"""
+        import gc
+        import pickle
+        spill_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spill_dir, True)
+        manager = DataProcessingManager(memory_budget=20000, spill_dir=spill_dir)
+        data = "budgeted streaming text " * 5000
+
+        plain = self.manager.process_with_approach(data, "streaming")
+        budgeted = manager.process_with_approach(data, "streaming")
+        chunk_results = budgeted["chunk_results"]
+        self.assertGreater(budgeted["memory_budget"]["spilled_segments"], 0)
+        self.assertLessEqual(budgeted["memory_budget"]["in_memory_bytes"], 20000)
+        self.assertEqual(chunk_results, plain["chunk_results"])
+        self.assertEqual(chunk_results[-1], plain["chunk_results"][-1])
+        self.assertEqual(chunk_results[10:13], plain["chunk_results"][10:13])
+        self.assertEqual(pickle.loads(pickle.dumps(chunk_results)), plain["chunk_results"])
+
+        results_path = os.path.join(spill_dir, "results.jsonl")
+        with JsonlResultWriter(results_path) as writer:
+            writer.write_result("streaming", budgeted)
+        self.assertEqual(load_results(results_path)["streaming"]["chunk_results"], plain["chunk_results"])
+
+        # Segments are deleted once nothing references the spilled list
+        del budgeted, chunk_results
+        gc.collect()
+        self.assertEqual(os.listdir(spill_dir), ["results.jsonl"])
+
+    def test_per_call_memory_budget(self):
+        """Test a per-call budget and that unbudgeted calls keep plain lists"""
+        data = "per call budget " * 3000
+        result = self.manager.process_with_approach(data, "chunking", memory_budget=5000)
+        self.assertEqual(len(result["chunk_results"]), result["total_chunks"])
+        self.assertGreater(result["memory_budget"]["spilled_segments"], 0)
+        self.assertIsInstance(self.manager.process_with_approach(data, "chunking")["chunk_results"], list)
+
+    def test_manager_budget_accounts_each_call(self):
+        """Test held results from earlier calls neither count against nor show up in a later call"""
+        manager = DataProcessingManager(memory_budget=5000, cache=ResultCache())
+        data = "per call accounting " * 3000
+
+        first = manager.process_with_approach(data, "chunking")
+        second = manager.process_with_approach(data, "chunking")
+
+        self.assertEqual(second["memory_budget"], first["memory_budget"])
+        self.assertEqual(second["chunk_results"], first["chunk_results"])
+        # Budgeted results hold spill segments, so they are never cached
+        self.assertEqual(manager.cache.get_stats()["hits"] + manager.cache.get_stats()["misses"], 0)
+
+    def test_budget_shared_across_threads(self):
+        """Test lists filled concurrently under one budget keep its counters consistent"""
+        import gc
+        import threading
+        spill_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spill_dir, True)
+        budget = MemoryBudget(2000, ReferenceBasedProcessor(storage_dir=spill_dir))
+        lists = []
+
+        def fill():
+            with spilling(budget):
+                spilled = spillable_list()
+                spilled.extend({"chunk_index": i, "text": "x" * 50} for i in range(500))
+                lists.append(spilled)
+
+        threads = [threading.Thread(target=fill) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(budget.spilled_segments, sum(spilled.spilled_segments for spilled in lists))
+        self.assertEqual([len(spilled) for spilled in lists], [500] * 8)
+        del lists
+        gc.collect()
+        self.assertEqual(budget.report()["in_memory_bytes"], 0)
+
+    def test_process_many_keeps_input_order(self):
+        """Test bulk processing across worker processes returns results in input order"""
+        documents = [f"document {i} " * (i + 1) for i in range(20)] + [None]
+        result = self.manager.process_many(iter(documents), "truncation", workers=2, batch_size=3)
+
+        self.assertEqual(result["total_documents"], 21)
+        self.assertEqual(result["errors"], 1)
+        self.assertEqual(result["results"][:20], [self.manager.process_with_approach(doc, "truncation")
+                                                  for doc in documents[:20]])
+        self.assertGreater(result["documents_per_second"], 0)
+
+    def test_iter_many_unordered(self):
+        """Test unordered bulk iteration yields every document exactly once"""
+        indexes = [index for index, _ in self.manager.iter_many(range(1, 50), "summarization",
+                                                                 workers=2, batch_size=4, ordered=False)]
+
+        self.assertEqual(sorted(indexes), list(range(49)))
+
+    def test_iter_many_bounds_reorder_buffer(self):
+        """Test a slow first batch stops submission instead of buffering every later batch"""
+        pulled = []
+
+        def documents():
+            for i in range(200):
+                pulled.append(i)
+                yield "slow" if i == 0 else f"document {i}"
+
+        self.manager.processors['summarization'] = SlowHeadSummarizer()
+        results = self.manager.iter_many(documents(), "summarization", workers=2, batch_size=2)
+        self.assertEqual(next(results)[0], 0)
+
+        # At most workers * 2 batches are in flight or buffered
+        self.assertLessEqual(len(pulled), 8)
+        self.assertEqual([index for index, _ in results], list(range(1, 200)))
+
+    def test_iter_many_max_batch_chars(self):
+        """Test max_batch_chars closes batches early without changing results"""
+        documents = ["x" * 5000] + [f"document {i}" for i in range(30)]
+        batched = list(self.manager.iter_many(documents, "summarization", workers=2, batch_size=8,
+                                              max_batch_chars=1000))
+
+        self.assertEqual(batched, list(self.manager.iter_many(documents, "summarization", workers=2, batch_size=8)))
+
+    def test_process_with_all_approaches_timeout(self):
+        """Test a slow approach times out without holding back the others"""
+        class SlowSummarizer:
+            def process_with_summarization(self, data, profile=None):
+                time.sleep(1)
+                return {"method": "summarization"}
+
+        self.manager.processors['summarization'] = SlowSummarizer()
+        results = self.manager.process_with_all_approaches("some data " * 50, timeout=0.2)
+
+        self.assertIn("Timed out", results["summarization"]["error"])
+        self.assertEqual(results["chunking"]["method"], "chunking")
+
+    def test_timeout_starts_when_approach_runs(self):
+        """Test approaches queued behind busy workers get their full timeout with either executor"""
+        registry = ProcessorRegistry(approaches={}, discover_plugins=False)
+        names = [f"steady{i}" for i in range(4)]
+        for name in names:
+            registry.register(name, functools.partial(SteadyProcessor, name), "process")
+        manager = DataProcessingManager(registry=registry)
+
+        for executor in ("thread", "process"):
+            results = manager.process_with_all_approaches("some data " * 50, workers=1, timeout=0.35,
+                                                          executor=executor)
+            self.assertEqual({name: result.get("method") for name, result in results.items()},
+                             {name: name for name in names}, executor)
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the multi-stage Pipeline"""
+
+    def setUp(self):
+        if Pipeline is None or Stage is None:
+            self.skipTest("Pipeline not available - check pipeline.py")
+
+    def test_stages_with_fan_out(self):
+        """Test items flow through fan-out and multi-worker stages"""
+        pipeline = Pipeline([
+            Stage(lambda text: text.split(), fan_out=True),
+            Stage(str.upper, workers=3),
+        ], queue_size=2)
+        outputs = list(pipeline.run(["a b", "c d e"]))
+
+        self.assertEqual(sorted(outputs), ["A", "B", "C", "D", "E"])
+
+    def test_single_worker_stages_keep_order(self):
+        """Test output order is preserved when every stage has one worker"""
+        pipeline = Pipeline([Stage(lambda x: x * 2), Stage(lambda x: x + 1)], queue_size=1)
+
+        self.assertEqual(list(pipeline.run(range(20))), [x * 2 + 1 for x in range(20)])
+
+    def test_stage_error_is_raised(self):
+        """Test a failing stage stops the pipeline and re-raises its error"""
+        def fail_on_five(x):
+            if x == 5:
+                raise ValueError("bad item")
+            return x
+
+        with self.assertRaises(ValueError):
+            list(Pipeline([Stage(fail_on_five, workers=2)]).run(range(100)))
+
+class TestProcessorRegistry(unittest.TestCase):
+    """Test cases for the lazy ProcessorRegistry"""
+
+    def setUp(self):
+        if ProcessorRegistry is None or DataProcessingManager is None:
+            self.skipTest("ProcessorRegistry not available - check registry.py")
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_processors_built_on_first_use(self):
+        """Test only the approaches actually used are instantiated"""
+        manager = DataProcessingManager(registry=ProcessorRegistry(discover_plugins=False))
+        self.assertEqual(len(manager.processors), 0)
+        manager.process_with_approach("lazy registry data " * 20, "truncation")
+        self.assertEqual(list(manager.processors.keys()), ["truncation"])
+        self.assertIn("streaming", manager.get_available_approaches())
+
+    def test_unknown_approach(self):
+        """Test unknown approaches are rejected with the available names"""
+        manager = DataProcessingManager(registry=ProcessorRegistry(discover_plugins=False))
+        with self.assertRaises(ValueError):
+            manager.get_approach_method("missing")
+
+    def test_register_custom_approach(self):
+        """Test registering a callable factory and a 'module:attribute' factory"""
+        class UpperProcessor:
+            def process(self, data, profile=None):
+                return {"method": "upper", "data": str(data).upper()}
+
+        registry = ProcessorRegistry(discover_plugins=False)
+        registry.register("upper", UpperProcessor, "process")
+        registry.register("chunks", "approaches.approach1:ChunkingProcessor", "process_large_data_in_chunks")
+        manager = DataProcessingManager(registry=registry)
+        self.assertEqual(manager.process_with_approach("abc", "upper")["data"], "ABC")
+        self.assertEqual(manager.process_with_approach("abc", "chunks")["method"], "chunking")
+
+    def test_method_without_profile_parameter(self):
+        """Test a plugin method taking only data works without the cache and with it"""
+        class KeywordProcessor:
+            def process(self, data):
+                return {"method": "keywords", "keywords": sorted(set(str(data).split()))}
+
+        registry = ProcessorRegistry(discover_plugins=False)
+        registry.register("keywords", KeywordProcessor, "process")
+        for cache in (None, ResultCache()):
+            manager = DataProcessingManager(registry=registry, cache=cache)
+            self.assertEqual(manager.process_with_approach("b a b", "keywords")["keywords"], ["a", "b"])
+            self.assertEqual(manager.process_with_all_approaches("b a b")["keywords"]["method"], "keywords")
+
+    def test_reference_storage_created_on_first_write(self):
+        """Test building a ReferenceBasedProcessor has no filesystem side effects"""
+        storage_dir = os.path.join(self.temp_dir, "storage")
+        processor = ReferenceBasedProcessor(storage_dir=storage_dir)
+        self.assertFalse(os.path.exists(storage_dir))
+        data_id = processor.save_to_storage({"key": "value"})
+        self.assertEqual(processor.load_from_storage(data_id), {"key": "value"})
+
 class TestProjectStructure(unittest.TestCase):
     """Test cases for project structure and file existence"""
     
@@ -278,6 +1107,26 @@ class TestProjectStructure(unittest.TestCase):
         """Test that main.py exists"""
         main_file = os.path.join(src_dir, 'main.py')
         self.assertTrue(os.path.exists(main_file), f"Main file not found: {main_file}")
+    
+    def test_approaches_import_from_package_path(self):
+        """Test every approach module also imports as src.approaches.* from the project root"""
+        import subprocess
+        
+        modules = ", ".join(f"src.approaches.approach{n}" for n in range(1, 7))
+        completed = subprocess.run([sys.executable, "-c", f"import {modules}"],
+                                   cwd=os.path.join(src_dir, '..'), capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+    
+    def test_startup_leaves_process_pool_and_inspect_unloaded(self):
+        """Test building the manager and truncating once imports neither process pools nor inspect"""
+        import subprocess
+        
+        script = ("import sys, main; main.DataProcessingManager().process_with_approach('abc', 'truncation'); "
+                  "print(sorted({'concurrent.futures.process', 'inspect'} & set(sys.modules)))")
+        completed = subprocess.run([sys.executable, "-c", script],
+                                   cwd=src_dir, capture_output=True, text=True)
+        self.assertEqual(completed.returncode, 0, completed.stderr)
+        self.assertEqual(completed.stdout.strip().splitlines()[-1], "[]")
 
 def print_import_status():
     """Print the status of all imports"""
@@ -336,8 +1185,14 @@ def run_tests():
         TestHierarchicalProcessor,
         TestTokenAwareTruncationProcessor,
         TestStreamingProcessor,
+        TestAsyncStreamingProcessor,
         TestHelpers,
         TestDataProcessingManager,
+        TestResultCache,
+        TestSharedPayload,
+        TestJsonlResultWriter,
+        TestPipeline,
+        TestProcessorRegistry,
     ]
     
     # Run tests for each class individually